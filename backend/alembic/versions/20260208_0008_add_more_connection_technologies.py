@@ -17,10 +17,13 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.execute("ALTER TYPE connection_technology ADD VALUE IF NOT EXISTS 'ZIGBEE'")
-    op.execute("ALTER TYPE connection_technology ADD VALUE IF NOT EXISTS 'MATTER_OVER_THREAD'")
-    op.execute("ALTER TYPE connection_technology ADD VALUE IF NOT EXISTS 'BLUETOOTH'")
-    op.execute("ALTER TYPE connection_technology ADD VALUE IF NOT EXISTS 'BLE'")
+    # New enum values cannot be used in the transaction that adds them, so commit
+    # each ALTER TYPE on its own instead of inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE connection_technology ADD VALUE IF NOT EXISTS 'ZIGBEE'")
+        op.execute("ALTER TYPE connection_technology ADD VALUE IF NOT EXISTS 'MATTER_OVER_THREAD'")
+        op.execute("ALTER TYPE connection_technology ADD VALUE IF NOT EXISTS 'BLUETOOTH'")
+        op.execute("ALTER TYPE connection_technology ADD VALUE IF NOT EXISTS 'BLE'")
 
 
 def downgrade() -> None:
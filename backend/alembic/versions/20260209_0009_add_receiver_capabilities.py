@@ -19,33 +19,16 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.add_column(
-        "devices",
-        sa.Column("is_receiver", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-    )
-    op.add_column(
-        "devices",
-        sa.Column("supports_wifi", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-    )
-    op.add_column(
-        "devices",
-        sa.Column("supports_ethernet", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-    )
-    op.add_column(
-        "devices",
-        sa.Column("supports_zigbee", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-    )
-    op.add_column(
-        "devices",
-        sa.Column("supports_matter_thread", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-    )
-    op.add_column(
-        "devices",
-        sa.Column("supports_bluetooth", sa.Boolean(), nullable=False, server_default=sa.text("false")),
-    )
-    op.add_column(
-        "devices",
-        sa.Column("supports_ble", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+    # One ALTER TABLE so all capability columns are added under a single lock.
+    op.execute(
+        "ALTER TABLE devices "
+        "ADD COLUMN is_receiver BOOLEAN DEFAULT false NOT NULL, "
+        "ADD COLUMN supports_wifi BOOLEAN DEFAULT false NOT NULL, "
+        "ADD COLUMN supports_ethernet BOOLEAN DEFAULT false NOT NULL, "
+        "ADD COLUMN supports_zigbee BOOLEAN DEFAULT false NOT NULL, "
+        "ADD COLUMN supports_matter_thread BOOLEAN DEFAULT false NOT NULL, "
+        "ADD COLUMN supports_bluetooth BOOLEAN DEFAULT false NOT NULL, "
+        "ADD COLUMN supports_ble BOOLEAN DEFAULT false NOT NULL"
     )
 
     op.add_column("connections", sa.Column("receiver_id", postgresql.UUID(as_uuid=True), nullable=True))
@@ -65,10 +48,13 @@ def downgrade() -> None:
     op.drop_index("ix_connections_receiver_id", table_name="connections")
     op.drop_column("connections", "receiver_id")
 
-    op.drop_column("devices", "supports_ble")
-    op.drop_column("devices", "supports_bluetooth")
-    op.drop_column("devices", "supports_matter_thread")
-    op.drop_column("devices", "supports_zigbee")
-    op.drop_column("devices", "supports_ethernet")
-    op.drop_column("devices", "supports_wifi")
-    op.drop_column("devices", "is_receiver")
+    op.execute(
+        "ALTER TABLE devices "
+        "DROP COLUMN supports_ble, "
+        "DROP COLUMN supports_bluetooth, "
+        "DROP COLUMN supports_matter_thread, "
+        "DROP COLUMN supports_zigbee, "
+        "DROP COLUMN supports_ethernet, "
+        "DROP COLUMN supports_wifi, "
+        "DROP COLUMN is_receiver"
+    )
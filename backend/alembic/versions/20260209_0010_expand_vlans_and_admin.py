@@ -18,17 +18,24 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    op.add_column("vlans", sa.Column("subnet_mask", sa.String(length=64), nullable=True))
-    op.add_column("vlans", sa.Column("ip_range_start", sa.String(length=64), nullable=True))
-    op.add_column("vlans", sa.Column("ip_range_end", sa.String(length=64), nullable=True))
-
-    op.execute("UPDATE vlans SET subnet_mask = '255.255.255.0' WHERE subnet_mask IS NULL")
-    op.execute("UPDATE vlans SET ip_range_start = '0.0.0.0' WHERE ip_range_start IS NULL")
-    op.execute("UPDATE vlans SET ip_range_end = '0.0.0.0' WHERE ip_range_end IS NULL")
-
-    op.alter_column("vlans", "subnet_mask", nullable=False)
-    op.alter_column("vlans", "ip_range_start", nullable=False)
-    op.alter_column("vlans", "ip_range_end", nullable=False)
+    # A constant server default lets PostgreSQL fill existing rows from the catalog
+    # instead of rewriting the table with backfill UPDATEs.
+    op.add_column(
+        "vlans",
+        sa.Column("subnet_mask", sa.String(length=64), nullable=False, server_default="255.255.255.0"),
+    )
+    op.add_column(
+        "vlans",
+        sa.Column("ip_range_start", sa.String(length=64), nullable=False, server_default="0.0.0.0"),
+    )
+    op.add_column(
+        "vlans",
+        sa.Column("ip_range_end", sa.String(length=64), nullable=False, server_default="0.0.0.0"),
+    )
+
+    op.alter_column("vlans", "subnet_mask", server_default=None)
+    op.alter_column("vlans", "ip_range_start", server_default=None)
+    op.alter_column("vlans", "ip_range_end", server_default=None)
 
 
 def downgrade() -> None:
@@ -0,0 +1,40 @@
+"""index foreign key columns
+
+Revision ID: 20260210_0012
+Revises: 20260209_0011
+Create Date: 2026-02-10 09:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0012"
+down_revision: Union[str, None] = "20260209_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # PostgreSQL does not index referencing columns automatically; without these
+    # ON DELETE CASCADE / SET NULL checks and parent joins fall back to seq scans.
+    op.create_index("ix_locations_parent_id", "locations", ["parent_id"], unique=False)
+    op.create_index("ix_locations_root_id", "locations", ["root_id"], unique=False)
+    op.create_index("ix_user_roots_root_id", "user_roots", ["root_id"], unique=False)
+    op.create_index("ix_wifi_networks_vlan_id", "wifi_networks", ["vlan_id"], unique=False)
+    op.create_index("ix_connections_from_interface_id", "connections", ["from_interface_id"], unique=False)
+    op.create_index("ix_connections_to_interface_id", "connections", ["to_interface_id"], unique=False)
+    op.create_index("ix_connections_vlan_id", "connections", ["vlan_id"], unique=False)
+    op.create_index("ix_secrets_linked_device_id", "secrets", ["linked_device_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_secrets_linked_device_id", table_name="secrets")
+    op.drop_index("ix_connections_vlan_id", table_name="connections")
+    op.drop_index("ix_connections_to_interface_id", table_name="connections")
+    op.drop_index("ix_connections_from_interface_id", table_name="connections")
+    op.drop_index("ix_wifi_networks_vlan_id", table_name="wifi_networks")
+    op.drop_index("ix_user_roots_root_id", table_name="user_roots")
+    op.drop_index("ix_locations_root_id", table_name="locations")
+    op.drop_index("ix_locations_parent_id", table_name="locations")
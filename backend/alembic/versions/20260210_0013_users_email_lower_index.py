@@ -0,0 +1,27 @@
+"""make users email index case-insensitive
+
+Revision ID: 20260210_0013
+Revises: 20260210_0012
+Create Date: 2026-02-10 09:20:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0013"
+down_revision: Union[str, None] = "20260210_0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_index("ix_users_email", "users", [sa.text("lower(email)")], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
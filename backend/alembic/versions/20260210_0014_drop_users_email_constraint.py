@@ -0,0 +1,27 @@
+"""drop duplicate users email unique constraint
+
+Revision ID: 20260210_0014
+Revises: 20260210_0013
+Create Date: 2026-02-10 09:40:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0014"
+down_revision: Union[str, None] = "20260210_0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created before the initial migration dropped UNIQUE(email) still
+    # carry it next to ix_users_email; fresh databases never had it.
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS users_email_key")
+
+
+def downgrade() -> None:
+    # Uniqueness stays enforced by ix_users_email, so the duplicate is not restored.
+    pass
@@ -0,0 +1,31 @@
+"""add root_id/created_at indexes for ordered listings
+
+Revision ID: 20260210_0015
+Revises: 20260210_0014
+Create Date: 2026-02-10 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0015"
+down_revision: Union[str, None] = "20260210_0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composite indexes lead with root_id, so the single-column ones become redundant.
+    op.create_index("ix_connections_root_id_created_at", "connections", ["root_id", "created_at"], unique=False)
+    op.drop_index("ix_connections_root_id", table_name="connections")
+    op.create_index("ix_secrets_root_id_created_at", "secrets", ["root_id", "created_at"], unique=False)
+    op.drop_index("ix_secrets_root_id", table_name="secrets")
+
+
+def downgrade() -> None:
+    op.create_index("ix_secrets_root_id", "secrets", ["root_id"], unique=False)
+    op.drop_index("ix_secrets_root_id_created_at", table_name="secrets")
+    op.create_index("ix_connections_root_id", "connections", ["root_id"], unique=False)
+    op.drop_index("ix_connections_root_id_created_at", table_name="connections")
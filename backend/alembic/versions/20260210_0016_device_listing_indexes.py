@@ -0,0 +1,40 @@
+"""add composite indexes for ordered device listings
+
+Revision ID: 20260210_0016
+Revises: 20260210_0015
+Create Date: 2026-02-10 11:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0016"
+down_revision: Union[str, None] = "20260210_0015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Both match the list ordering (name, created_at, id) so rows come back pre-sorted;
+    # the root one leads with root_id and replaces the single-column index.
+    op.create_index(
+        "ix_devices_root_id_name_created_at",
+        "devices",
+        ["root_id", "name", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_devices_root_id_space_id_name_created_at",
+        "devices",
+        ["root_id", "space_id", "name", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_devices_root_id", table_name="devices")
+
+
+def downgrade() -> None:
+    op.create_index("ix_devices_root_id", "devices", ["root_id"], unique=False)
+    op.drop_index("ix_devices_root_id_space_id_name_created_at", table_name="devices")
+    op.drop_index("ix_devices_root_id_name_created_at", table_name="devices")
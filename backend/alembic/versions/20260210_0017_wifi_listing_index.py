@@ -0,0 +1,33 @@
+"""add composite index for ordered wifi listings
+
+Revision ID: 20260210_0017
+Revises: 20260210_0016
+Create Date: 2026-02-10 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0017"
+down_revision: Union[str, None] = "20260210_0016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Matches list_wifi (root filter, ssid/created_at order); it leads with
+    # root_id, so the single-column index becomes redundant.
+    op.create_index(
+        "ix_wifi_networks_root_id_ssid_created_at",
+        "wifi_networks",
+        ["root_id", "ssid", "created_at"],
+        unique=False,
+    )
+    op.drop_index("ix_wifi_networks_root_id", table_name="wifi_networks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_wifi_networks_root_id", "wifi_networks", ["root_id"], unique=False)
+    op.drop_index("ix_wifi_networks_root_id_ssid_created_at", table_name="wifi_networks")
@@ -0,0 +1,51 @@
+"""store user roles and secret types as smallint codes
+
+Revision ID: 20260210_0018
+Revises: 20260210_0017
+Create Date: 2026-02-10 13:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0018"
+down_revision: Union[str, None] = "20260210_0017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Codes must match USER_ROLE_CODES and SECRET_TYPE_CODES in the models.
+    op.execute(
+        """
+        ALTER TABLE users ALTER COLUMN role TYPE smallint
+        USING (CASE role WHEN 'USER' THEN 0 WHEN 'ADMIN' THEN 1 END)
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE secrets ALTER COLUMN type TYPE smallint
+        USING (CASE type WHEN 'PASSWORD' THEN 0 WHEN 'TOKEN' THEN 1 WHEN 'API_KEY' THEN 2 WHEN 'OTHER' THEN 3 END)
+        """
+    )
+    op.execute("DROP TYPE IF EXISTS user_role")
+    op.execute("DROP TYPE IF EXISTS secret_type")
+
+
+def downgrade() -> None:
+    op.execute("CREATE TYPE user_role AS ENUM ('USER', 'ADMIN')")
+    op.execute("CREATE TYPE secret_type AS ENUM ('PASSWORD', 'TOKEN', 'API_KEY', 'OTHER')")
+    op.execute(
+        """
+        ALTER TABLE users ALTER COLUMN role TYPE user_role
+        USING ((ARRAY['USER', 'ADMIN'])[role + 1]::user_role)
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE secrets ALTER COLUMN type TYPE secret_type
+        USING ((ARRAY['PASSWORD', 'TOKEN', 'API_KEY', 'OTHER'])[type + 1]::secret_type)
+        """
+    )
@@ -0,0 +1,32 @@
+"""add partial index on admin users for the setup check
+
+Revision ID: 20260210_0020
+Revises: 20260210_0018
+Create Date: 2026-02-10 15:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0020"
+down_revision: Union[str, None] = "20260210_0018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Role code 1 is ADMIN, as stored since revision 20260210_0018.
+    op.create_index(
+        "ix_users_admin",
+        "users",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("role = 1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_admin", table_name="users")
@@ -0,0 +1,25 @@
+"""add lower(mac) index on interfaces for MAC lookups
+
+Revision ID: 20260210_0021
+Revises: 20260210_0020
+Create Date: 2026-02-10 16:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0021"
+down_revision: Union[str, None] = "20260210_0020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_interfaces_mac_lower", "interfaces", [sa.text("lower(mac)")], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_interfaces_mac_lower", table_name="interfaces")
@@ -0,0 +1,50 @@
+"""store secret and wifi ciphertext as bytea
+
+Revision ID: 20260210_0022
+Revises: 20260210_0021
+Create Date: 2026-02-10 17:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0022"
+down_revision: Union[str, None] = "20260210_0021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = (("secrets", "encrypted_value"), ("wifi_networks", "password_encrypted"))
+
+
+def upgrade() -> None:
+    # "v2:" + urlsafe base64 becomes a 0x02 version byte + the decoded payload;
+    # legacy Fernet tokens are kept as their ASCII bytes (see app.core.crypto).
+    for table, column in _COLUMNS:
+        op.execute(
+            f"""
+            ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea
+            USING (
+                CASE WHEN {column} LIKE 'v2:%'
+                THEN '\\x02'::bytea || decode(translate(substr({column}, 4), '-_', '+/'), 'base64')
+                ELSE convert_to({column}, 'UTF8')
+                END
+            )
+            """
+        )
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.execute(
+            f"""
+            ALTER TABLE {table} ALTER COLUMN {column} TYPE text
+            USING (
+                CASE WHEN get_byte({column}, 0) = 2
+                THEN 'v2:' || translate(replace(encode(substr({column}, 2), 'base64'), E'\\n', ''), '+/', '-_')
+                ELSE convert_from({column}, 'UTF8')
+                END
+            )
+            """
+        )
@@ -0,0 +1,26 @@
+"""store vlan cidr as native cidr
+
+Revision ID: 20260210_0023
+Revises: 20260210_0022
+Create Date: 2026-02-10 18:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20260210_0023"
+down_revision: Union[str, None] = "20260210_0022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every stored value is a network address: the API validates with strict=True
+    # and revision 20260209_0011 derived the rest with ipaddress.ip_network.
+    op.execute("ALTER TABLE vlans ALTER COLUMN cidr TYPE cidr USING cidr::cidr")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE vlans ALTER COLUMN cidr TYPE varchar(64) USING cidr::text")
@@ -3,8 +3,8 @@ from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
-from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import delete, select
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from sqlalchemy import bindparam, delete, func, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -17,12 +17,25 @@ from app.core.security import (
 )
 from app.core.settings import get_settings
 from app.db.session import get_db
+from app.db.uuid7 import uuid7
 from app.models.location import Location
 from app.models.user import User, UserRole
 from app.models.user_root import UserRoot
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+MAX_ROOT_IDS_PER_USER = 256
+
+_LIST_USERS_STMT = select(User).order_by(User.created_at.asc())
+_LIST_USER_ROOTS_STMT = select(UserRoot.user_id, UserRoot.root_id)
+_READ_USER_ROOT_IDS_STMT = select(UserRoot.root_id).where(UserRoot.user_id == bindparam("user_id"))
+_DELETE_USER_ROOTS_STMT = delete(UserRoot).where(UserRoot.user_id == bindparam("user_id"))
+_COUNT_ROOTS_STMT = (
+    select(func.count())
+    .select_from(Location)
+    .where(Location.id.in_(bindparam("root_ids", expanding=True)), Location.id == Location.root_id)
+)
+
 
 class ResetPasswordResponse(BaseModel):
     temporary_password: str
@@ -45,7 +58,12 @@ class CreateUserRequest(BaseModel):
     password: str
     role: UserRole = UserRole.USER
     is_active: bool = True
-    root_ids: list[UUID] = Field(default_factory=list)
+    root_ids: list[UUID] = Field(default_factory=list, max_length=MAX_ROOT_IDS_PER_USER)
+
+    @field_validator("root_ids")
+    @classmethod
+    def _dedupe_root_ids(cls, value: list[UUID]) -> list[UUID]:
+        return list(dict.fromkeys(value))
 
 
 class UpdateUserRequest(BaseModel):
@@ -54,7 +72,12 @@ class UpdateUserRequest(BaseModel):
     email: str | None = None
     role: UserRole | None = None
     is_active: bool | None = None
-    root_ids: list[UUID] | None = None
+    root_ids: list[UUID] | None = Field(default=None, max_length=MAX_ROOT_IDS_PER_USER)
+
+    @field_validator("root_ids")
+    @classmethod
+    def _dedupe_root_ids(cls, value: list[UUID] | None) -> list[UUID] | None:
+        return list(dict.fromkeys(value)) if value is not None else None
 
 
 class SetUserPasswordRequest(BaseModel):
@@ -65,36 +88,34 @@ class SetUserPasswordRequest(BaseModel):
 
 
 def _validate_root_ids(db: Session, root_ids: list[UUID]) -> list[UUID]:
-    unique_root_ids = list(dict.fromkeys(root_ids))
-    if not unique_root_ids:
+    # Callers pass ids that are already unique (request validators or user_roots rows).
+    if not root_ids:
         return []
 
-    roots = db.scalars(select(Location.id).where(Location.id.in_(unique_root_ids), Location.id == Location.root_id)).all()
-    valid_root_ids = set(roots)
-    missing = [root_id for root_id in unique_root_ids if root_id not in valid_root_ids]
-    if missing:
+    found = db.scalar(_COUNT_ROOTS_STMT, {"root_ids": root_ids})
+    if found != len(root_ids):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="One or more roots were not found")
-    return unique_root_ids
+    return root_ids
 
 
 def _read_user_root_ids(db: Session, user_id: UUID) -> list[UUID]:
-    return list(db.scalars(select(UserRoot.root_id).where(UserRoot.user_id == user_id)).all())
+    return list(db.scalars(_READ_USER_ROOT_IDS_STMT, {"user_id": user_id}).all())
 
 
 def _set_user_root_ids(db: Session, user_id: UUID, root_ids: list[UUID]) -> None:
-    db.execute(delete(UserRoot).where(UserRoot.user_id == user_id))
-    for root_id in root_ids:
-        db.add(UserRoot(user_id=user_id, root_id=root_id))
+    db.execute(_DELETE_USER_ROOTS_STMT, {"user_id": user_id})
+    if root_ids:
+        db.execute(insert(UserRoot), [{"user_id": user_id, "root_id": root_id} for root_id in root_ids])
 
 
-def _to_admin_user_response(db: Session, user: User) -> AdminUserResponse:
+def _to_admin_user_response(user: User, root_ids: list[UUID]) -> AdminUserResponse:
     return AdminUserResponse(
         id=user.id,
         email=user.email,
         role=user.role,
         is_active=user.is_active,
         must_change_password=user.must_change_password,
-        root_ids=_read_user_root_ids(db, user.id),
+        root_ids=root_ids,
         created_at=user.created_at,
     )
 
@@ -124,24 +145,13 @@ def list_users(
     _: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ) -> list[AdminUserResponse]:
-    users = db.scalars(select(User).order_by(User.created_at.asc())).all()
-    assignments = db.execute(select(UserRoot.user_id, UserRoot.root_id)).all()
+    users = db.scalars(_LIST_USERS_STMT).all()
+    assignments = db.execute(_LIST_USER_ROOTS_STMT).all()
     roots_by_user: dict[UUID, list[UUID]] = {}
     for user_id, root_id in assignments:
         roots_by_user.setdefault(user_id, []).append(root_id)
 
-    return [
-        AdminUserResponse(
-            id=user.id,
-            email=user.email,
-            role=user.role,
-            is_active=user.is_active,
-            must_change_password=user.must_change_password,
-            root_ids=roots_by_user.get(user.id, []),
-            created_at=user.created_at,
-        )
-        for user in users
-    ]
+    return [_to_admin_user_response(user, roots_by_user.get(user.id, [])) for user in users]
 
 
 @router.post("/users", response_model=AdminUserResponse, status_code=status.HTTP_201_CREATED)
@@ -157,23 +167,24 @@ def create_user(
     if payload.role == UserRole.USER and not validated_root_ids:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="USER must be assigned to at least one root")
 
+    # The id is assigned up front so the user and its root assignments go out in a
+    # single flush at commit; the unit of work inserts users before user_roots.
     user = User(
-        email=payload.email.lower(),
+        id=uuid7(),
+        email=payload.email,
         password_hash=hash_password(payload.password),
         role=payload.role,
         is_active=payload.is_active,
     )
     db.add(user)
+    db.add_all([UserRoot(user_id=user.id, root_id=root_id) for root_id in validated_root_ids])
     try:
-        db.flush()
+        db.commit()
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists") from exc
 
-    _set_user_root_ids(db, user.id, validated_root_ids)
-    db.commit()
-    db.refresh(user)
-    return _to_admin_user_response(db, user)
+    return _to_admin_user_response(user, validated_root_ids)
 
 
 @router.patch("/users/{user_id}", response_model=AdminUserResponse)
@@ -188,7 +199,7 @@ def update_user(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     if payload.email is not None:
-        user.email = payload.email.lower()
+        user.email = payload.email
     if payload.role is not None:
         user.role = payload.role
     if payload.is_active is not None:
@@ -211,8 +222,7 @@ def update_user(
         db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists") from exc
 
-    db.refresh(user)
-    return _to_admin_user_response(db, user)
+    return _to_admin_user_response(user, validated_root_ids)
 
 
 @router.post("/users/{user_id}/set-password", response_model=AdminUserResponse)
@@ -234,5 +244,4 @@ def set_user_password(
 
     db.add(user)
     db.commit()
-    db.refresh(user)
-    return _to_admin_user_response(db, user)
+    return _to_admin_user_response(user, _read_user_root_ids(db, user.id))
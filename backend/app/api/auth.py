@@ -1,12 +1,14 @@
+import secrets
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, ConfigDict
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel, ConfigDict, field_validator
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_admin, require_user
-from app.core.jwt import create_access_token, create_refresh_token, decode_token
+from app.api.etag import conditional_response
+from app.core.jwt import create_access_token, create_refresh_token, decode_token, parse_subject
 from app.core.security import (
     PASSWORD_POLICY_MESSAGE,
     hash_password,
@@ -18,6 +20,15 @@ from app.models.user import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Unknown emails are checked against this hash so a miss costs the same bcrypt
+# work as a wrong password and response time does not reveal registered emails.
+# verify_password's cache does not undo this: only a correct password for that
+# exact hash can hit it, so a fast reply tells the caller nothing the success
+# response does not.
+_DUMMY_PASSWORD_HASH = hash_password(secrets.token_urlsafe(32))
+
+_USER_BY_EMAIL_STMT = select(User).where(func.lower(User.email) == bindparam("email")).limit(1)
+
 
 class LoginRequest(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -25,6 +36,11 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
+    @field_validator("email")
+    @classmethod
+    def _normalize_email(cls, value: str) -> str:
+        return value.lower()
+
 
 class RefreshRequest(BaseModel):
     refresh_token: str
@@ -58,12 +74,11 @@ class AdminCheckResponse(BaseModel):
 
 
 def authenticate_credentials(db: Session, email: str, password: str) -> User | None:
-    user = db.scalar(select(User).where(User.email == email.lower()).limit(1))
-    if user is None:
-        return None
-    if not verify_password(password, user.password_hash):
-        return None
-    if not user.is_active:
+    # LoginRequest lowercases the email; lower(email) on the column keeps the index usable.
+    user = db.scalar(_USER_BY_EMAIL_STMT, {"email": email})
+    password_hash = user.password_hash if user is not None else _DUMMY_PASSWORD_HASH
+    password_ok = verify_password(password, password_hash)
+    if user is None or not password_ok or not user.is_active:
         return None
     return user
 
@@ -87,7 +102,12 @@ def refresh(payload: RefreshRequest, db: Session = Depends(get_db)) -> AuthToken
     if subject is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
 
-    user = db.get(User, UUID(subject))
+    try:
+        user_id = parse_subject(subject)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject") from exc
+
+    user = db.get(User, user_id)
     if user is None or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
 
@@ -98,14 +118,15 @@ def refresh(payload: RefreshRequest, db: Session = Depends(get_db)) -> AuthToken
 
 
 @router.get("/me", response_model=MeResponse)
-def me(current_user: User = Depends(require_user)) -> MeResponse:
-    return MeResponse(
+def me(request: Request, response: Response, current_user: User = Depends(require_user)) -> MeResponse | Response:
+    body = MeResponse(
         id=current_user.id,
         email=current_user.email,
         role=current_user.role.value,
         is_active=current_user.is_active,
         must_change_password=current_user.must_change_password,
     )
+    return conditional_response(request, response, body)
 
 
 @router.post("/change-password", response_model=StatusResponse)
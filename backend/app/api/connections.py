@@ -1,13 +1,15 @@
 from datetime import datetime
+from operator import attrgetter
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel, ConfigDict
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from sqlalchemy import or_, select
 from sqlalchemy.orm import Session, aliased
 
 from app.api.deps import require_admin, require_user
-from app.api.root_access import ensure_root_exists, require_root_access
+from app.api.pagination import Page, apply_page, page_params
+from app.api.root_access import ensure_root_exists, require_accessible_root
 from app.db.session import get_db
 from app.models.connection import Connection, ConnectionTechnology
 from app.models.device import Device
@@ -23,6 +25,9 @@ TECHNOLOGY_RECEIVER_CAPABILITY = {
     ConnectionTechnology.BLUETOOTH: "supports_bluetooth",
     ConnectionTechnology.BLE: "supports_ble",
 }
+_TECHNOLOGY_RECEIVER_GETTER = {
+    technology: attrgetter(capability) for technology, capability in TECHNOLOGY_RECEIVER_CAPABILITY.items()
+}
 
 
 class ConnectionResponse(BaseModel):
@@ -39,6 +44,9 @@ class ConnectionResponse(BaseModel):
     created_at: datetime
 
 
+_CONNECTION_LIST_ADAPTER = TypeAdapter(list[ConnectionResponse])
+
+
 class CreateConnectionRequest(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
@@ -51,16 +59,20 @@ class CreateConnectionRequest(BaseModel):
     notes: str | None = None
 
 
-def _get_interface_with_device(db: Session, interface_id: UUID) -> tuple[Interface, Device]:
-    row = db.execute(
+def _get_endpoints_with_devices(
+    db: Session,
+    from_interface_id: UUID,
+    to_interface_id: UUID,
+) -> tuple[tuple[Interface, Device], tuple[Interface, Device]]:
+    rows = db.execute(
         select(Interface, Device)
         .join(Device, Interface.device_id == Device.id)
-        .where(Interface.id == interface_id)
-        .limit(1)
-    ).first()
-    if row is None:
+        .where(Interface.id.in_([from_interface_id, to_interface_id]))
+    ).all()
+    by_interface_id = {row[0].id: (row[0], row[1]) for row in rows}
+    if from_interface_id not in by_interface_id or to_interface_id not in by_interface_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Interface not found")
-    return row[0], row[1]
+    return by_interface_id[from_interface_id], by_interface_id[to_interface_id]
 
 
 def _validate_vlan(db: Session, root_id: UUID, vlan_id: UUID | None) -> None:
@@ -74,8 +86,8 @@ def _validate_vlan(db: Session, root_id: UUID, vlan_id: UUID | None) -> None:
 
 
 def _validate_receiver(db: Session, root_id: UUID, technology: ConnectionTechnology, receiver_id: UUID | None) -> UUID | None:
-    required_capability = TECHNOLOGY_RECEIVER_CAPABILITY.get(technology)
-    if required_capability is None and receiver_id is None:
+    capability_getter = _TECHNOLOGY_RECEIVER_GETTER.get(technology)
+    if capability_getter is None and receiver_id is None:
         return None
 
     if receiver_id is None:
@@ -92,7 +104,7 @@ def _validate_receiver(db: Session, root_id: UUID, technology: ConnectionTechnol
     if not receiver.is_receiver:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Selected device is not a receiver")
 
-    if required_capability and not bool(getattr(receiver, required_capability)):
+    if capability_getter is not None and not capability_getter(receiver):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Receiver does not support {technology.value}",
@@ -112,8 +124,11 @@ def create_connection(
     if payload.from_interface_id == payload.to_interface_id:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Connection endpoints must be different")
 
-    from_interface, from_device = _get_interface_with_device(db, payload.from_interface_id)
-    to_interface, to_device = _get_interface_with_device(db, payload.to_interface_id)
+    (from_interface, from_device), (to_interface, to_device) = _get_endpoints_with_devices(
+        db,
+        payload.from_interface_id,
+        payload.to_interface_id,
+    )
 
     if from_device.root_id != to_device.root_id or from_device.root_id != payload.root_id:
         raise HTTPException(
@@ -143,7 +158,6 @@ def create_connection(
     )
     db.add(connection)
     db.commit()
-    db.refresh(connection)
 
     return ConnectionResponse(
         id=connection.id,
@@ -164,17 +178,29 @@ def create_connection(
 def list_connections(
     root_id: UUID = Query(...),
     device_id: UUID | None = Query(default=None),
+    page: Page = Depends(page_params),
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
-) -> list[ConnectionResponse]:
-    require_root_access(db, current_user, root_id)
-    ensure_root_exists(db, root_id)
+) -> Response:
+    require_accessible_root(db, current_user, root_id)
 
     from_interface = aliased(Interface)
     to_interface = aliased(Interface)
 
     query = (
-        select(Connection, from_interface.device_id.label("from_device_id"), to_interface.device_id.label("to_device_id"))
+        select(
+            Connection.id,
+            Connection.root_id,
+            Connection.from_interface_id,
+            Connection.to_interface_id,
+            from_interface.device_id.label("from_device_id"),
+            to_interface.device_id.label("to_device_id"),
+            Connection.receiver_id,
+            Connection.technology,
+            Connection.vlan_id,
+            Connection.notes,
+            Connection.created_at,
+        )
         .join(from_interface, Connection.from_interface_id == from_interface.id)
         .join(to_interface, Connection.to_interface_id == to_interface.id)
         .where(Connection.root_id == root_id)
@@ -183,20 +209,7 @@ def list_connections(
     if device_id is not None:
         query = query.where(or_(from_interface.device_id == device_id, to_interface.device_id == device_id))
 
-    rows = db.execute(query.order_by(Connection.created_at.desc())).all()
-    return [
-        ConnectionResponse(
-            id=row[0].id,
-            root_id=row[0].root_id,
-            from_interface_id=row[0].from_interface_id,
-            to_interface_id=row[0].to_interface_id,
-            from_device_id=row[1],
-            to_device_id=row[2],
-            receiver_id=row[0].receiver_id,
-            technology=row[0].technology,
-            vlan_id=row[0].vlan_id,
-            notes=row[0].notes,
-            created_at=row[0].created_at,
-        )
-        for row in rows
-    ]
+    rows = db.execute(apply_page(query.order_by(Connection.created_at.desc(), Connection.id.desc()), page)).all()
+    # Serialized by pydantic-core directly; response_model only documents the schema.
+    items = [ConnectionResponse.model_construct(**row._mapping) for row in rows]
+    return Response(content=_CONNECTION_LIST_ADAPTER.dump_json(items), media_type="application/json")
@@ -1,9 +1,7 @@
-import uuid
-
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.core.jwt import decode_token
+from app.core.jwt import decode_token, parse_subject
 from app.db.session import get_db
 from app.models.user import User, UserRole
 from sqlalchemy.orm import Session
@@ -32,7 +30,7 @@ def require_user(
         raise _unauthorized("Invalid token payload")
 
     try:
-        user_id = uuid.UUID(subject)
+        user_id = parse_subject(subject)
     except ValueError as exc:
         raise _unauthorized("Invalid token subject") from exc
 
@@ -1,13 +1,17 @@
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_admin, require_user
-from app.api.root_access import ensure_root_exists, require_root_access
+from app.api.etag import conditional_response
+from app.api.pagination import Page, apply_page, page_params
+from app.api.root_access import ensure_root_exists, require_accessible_root, require_root_access
 from app.db.session import get_db
 from app.models.connection import Connection
 from app.models.device import Device
@@ -26,6 +30,62 @@ RECEIVER_CAPABILITY_FIELDS = (
     "supports_bluetooth",
     "supports_ble",
 )
+_NO_RECEIVER_CAPABILITIES = dict.fromkeys(RECEIVER_CAPABILITY_FIELDS, False)
+# Capabilities travel as a bitmask; bit N is RECEIVER_CAPABILITY_FIELDS[N].
+_CAPABILITY_BITS = tuple((field, 1 << bit) for bit, field in enumerate(RECEIVER_CAPABILITY_FIELDS))
+_CAPABILITY_BIT_BY_FIELD = dict(_CAPABILITY_BITS)
+# PATCH semantics: required columns ignore an explicit null, optional ones clear on it.
+_REQUIRED_PATCH_FIELDS = frozenset({"space_id", "name", "type"})
+_OPTIONAL_PATCH_FIELDS = frozenset({"vendor", "model", "serial", "notes"})
+
+# List endpoints select plain columns: rows skip ORM instance state and the
+# identity map, and map 1:1 onto DeviceSummaryResponse fields.
+_DEVICE_SUMMARY_COLUMNS = (
+    Device.id,
+    Device.root_id,
+    Device.space_id,
+    Device.name,
+    Device.type,
+    Device.vendor,
+    Device.model,
+    Device.serial,
+    Device.notes,
+    Device.is_receiver,
+    Device.supports_wifi,
+    Device.supports_ethernet,
+    Device.supports_zigbee,
+    Device.supports_matter_thread,
+    Device.supports_bluetooth,
+    Device.supports_ble,
+    Device.created_at,
+)
+_LIST_DEVICES_STMT = (
+    select(*_DEVICE_SUMMARY_COLUMNS)
+    .where(Device.root_id == bindparam("root_id"))
+    .order_by(Device.name.asc(), Device.created_at.asc(), Device.id.asc())
+)
+_LIST_SPACE_DEVICES_STMT = (
+    select(*_DEVICE_SUMMARY_COLUMNS)
+    .where(Device.root_id == bindparam("root_id"), Device.space_id == bindparam("space_id"))
+    .order_by(Device.name.asc(), Device.created_at.asc(), Device.id.asc())
+)
+# Interfaces come back as one json array per device rather than as joined rows
+# repeating every device column; json_agg yields NULL for a device without any.
+_INTERFACES_JSON = (
+    select(
+        func.json_agg(aggregate_order_by(Interface.__table__.table_valued(), Interface.name.asc()), type_=JSON)
+    )
+    .where(Interface.device_id == Device.id)
+    .correlate(Device)
+    .scalar_subquery()
+    .label("interfaces")
+)
+_DEVICE_WITH_INTERFACES_STMT = select(*_DEVICE_SUMMARY_COLUMNS, _INTERFACES_JSON).where(
+    Device.id == bindparam("device_id")
+)
+_SPACE_IN_ROOT_STMT = select((Location.root_id == bindparam("root_id")).label("same_root")).where(
+    Location.id == bindparam("space_id")
+)
 
 
 class InterfaceResponse(BaseModel):
@@ -62,6 +122,10 @@ class DeviceDetailResponse(DeviceSummaryResponse):
     interfaces: list[InterfaceResponse]
 
 
+_DEVICE_LIST_ADAPTER = TypeAdapter(list[DeviceSummaryResponse])
+_INTERFACE_LIST_ADAPTER = TypeAdapter(list[InterfaceResponse])
+
+
 class CreateDeviceRequest(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
@@ -110,30 +174,35 @@ class CreateInterfaceRequest(BaseModel):
     notes: str | None = None
 
 
+def _device_fields(device: Device) -> dict[str, Any]:
+    return {
+        "id": device.id,
+        "root_id": device.root_id,
+        "space_id": device.space_id,
+        "name": device.name,
+        "type": device.type,
+        "vendor": device.vendor,
+        "model": device.model,
+        "serial": device.serial,
+        "notes": device.notes,
+        "is_receiver": device.is_receiver,
+        "supports_wifi": device.supports_wifi,
+        "supports_ethernet": device.supports_ethernet,
+        "supports_zigbee": device.supports_zigbee,
+        "supports_matter_thread": device.supports_matter_thread,
+        "supports_bluetooth": device.supports_bluetooth,
+        "supports_ble": device.supports_ble,
+        "created_at": device.created_at,
+    }
+
+
 def _device_to_summary(device: Device) -> DeviceSummaryResponse:
-    return DeviceSummaryResponse(
-        id=device.id,
-        root_id=device.root_id,
-        space_id=device.space_id,
-        name=device.name,
-        type=device.type,
-        vendor=device.vendor,
-        model=device.model,
-        serial=device.serial,
-        notes=device.notes,
-        is_receiver=device.is_receiver,
-        supports_wifi=device.supports_wifi,
-        supports_ethernet=device.supports_ethernet,
-        supports_zigbee=device.supports_zigbee,
-        supports_matter_thread=device.supports_matter_thread,
-        supports_bluetooth=device.supports_bluetooth,
-        supports_ble=device.supports_ble,
-        created_at=device.created_at,
-    )
+    # Rows come from the database already typed, so field validation is skipped.
+    return DeviceSummaryResponse.model_construct(**_device_fields(device))
 
 
 def _interface_to_response(interface: Interface) -> InterfaceResponse:
-    return InterfaceResponse(
+    return InterfaceResponse.model_construct(
         id=interface.id,
         device_id=interface.device_id,
         name=interface.name,
@@ -145,45 +214,58 @@ def _interface_to_response(interface: Interface) -> InterfaceResponse:
 
 
 def _validate_space(db: Session, root_id: UUID, space_id: UUID) -> None:
-    space = db.get(Location, space_id)
-    if space is None:
+    # One row answers both checks: no row means missing, False means another root.
+    same_root = db.scalar(_SPACE_IN_ROOT_STMT, {"space_id": space_id, "root_id": root_id})
+    if same_root is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
-    if space.root_id != root_id:
+    if not same_root:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Space must belong to the same root")
 
 
-def _collect_receiver_capabilities(source: object) -> dict[str, bool]:
-    return {field: bool(getattr(source, field)) for field in RECEIVER_CAPABILITY_FIELDS}
+def _collect_receiver_capabilities(source: "CreateDeviceRequest | Device") -> int:
+    return (
+        bool(source.supports_wifi)
+        | bool(source.supports_ethernet) << 1
+        | bool(source.supports_zigbee) << 2
+        | bool(source.supports_matter_thread) << 3
+        | bool(source.supports_bluetooth) << 4
+        | bool(source.supports_ble) << 5
+    )
 
 
-def _normalize_receiver_payload(is_receiver: bool, capabilities: dict[str, bool]) -> tuple[bool, dict[str, bool]]:
-    if not is_receiver and any(capabilities.values()):
+def _normalize_receiver_payload(is_receiver: bool, capabilities: int) -> tuple[bool, dict[str, bool]]:
+    if not is_receiver and capabilities:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Receiver capabilities can be set only when is_receiver=true",
         )
     if not is_receiver:
-        return False, {field: False for field in RECEIVER_CAPABILITY_FIELDS}
-    return True, capabilities
+        return False, _NO_RECEIVER_CAPABILITIES.copy()
+    return True, {field: bool(capabilities & bit) for field, bit in _CAPABILITY_BITS}
 
 
 @router.get("", response_model=list[DeviceSummaryResponse])
 def list_devices(
     root_id: UUID = Query(...),
     space_id: UUID | None = Query(default=None),
+    page: Page = Depends(page_params),
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
-) -> list[DeviceSummaryResponse]:
-    require_root_access(db, current_user, root_id)
-    ensure_root_exists(db, root_id)
+) -> Response:
+    require_accessible_root(db, current_user, root_id)
 
-    query = select(Device).where(Device.root_id == root_id)
-    if space_id is not None:
+    if space_id is None:
+        rows = db.execute(apply_page(_LIST_DEVICES_STMT, page), {"root_id": root_id}).all()
+    else:
         _validate_space(db, root_id, space_id)
-        query = query.where(Device.space_id == space_id)
-
-    devices = db.scalars(query.order_by(Device.name.asc(), Device.created_at.asc())).all()
-    return [_device_to_summary(device) for device in devices]
+        rows = db.execute(
+            apply_page(_LIST_SPACE_DEVICES_STMT, page),
+            {"root_id": root_id, "space_id": space_id},
+        ).all()
+    # Serialized here so FastAPI does not dump and re-validate every item against
+    # response_model, which is kept for the OpenAPI schema.
+    items = [DeviceSummaryResponse.model_construct(**row._mapping) for row in rows]
+    return Response(content=_DEVICE_LIST_ADAPTER.dump_json(items), media_type="application/json")
 
 
 @router.post("", response_model=DeviceSummaryResponse, status_code=status.HTTP_201_CREATED)
@@ -218,7 +300,6 @@ def create_device(
     )
     db.add(device)
     db.commit()
-    db.refresh(device)
 
     return _device_to_summary(device)
 
@@ -226,20 +307,23 @@ def create_device(
 @router.get("/{device_id}", response_model=DeviceDetailResponse)
 def get_device(
     device_id: UUID,
+    request: Request,
+    response: Response,
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
-) -> DeviceDetailResponse:
-    device = db.get(Device, device_id)
-    if device is None:
+) -> DeviceDetailResponse | Response:
+    row = db.execute(_DEVICE_WITH_INTERFACES_STMT, {"device_id": device_id}).first()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Device not found")
 
-    require_root_access(db, current_user, device.root_id)
+    require_root_access(db, current_user, row.root_id)
 
-    interfaces = db.scalars(select(Interface).where(Interface.device_id == device.id).order_by(Interface.name.asc())).all()
-    return DeviceDetailResponse(
-        **_device_to_summary(device).model_dump(),
-        interfaces=[_interface_to_response(interface) for interface in interfaces],
-    )
+    # Interface fields arrive as json strings, so they are validated back into
+    # UUIDs and datetimes; the device columns are already typed.
+    fields = dict(row._mapping)
+    interfaces = _INTERFACE_LIST_ADAPTER.validate_python(fields.pop("interfaces") or [])
+    body = DeviceDetailResponse.model_construct(**fields, interfaces=interfaces)
+    return conditional_response(request, response, body)
 
 
 @router.patch("/{device_id}", response_model=DeviceSummaryResponse)
@@ -255,29 +339,18 @@ def update_device(
 
     if payload.space_id is not None:
         _validate_space(db, device.root_id, payload.space_id)
-        device.space_id = payload.space_id
-    if payload.name is not None:
-        device.name = payload.name
-    if payload.type is not None:
-        device.type = payload.type
-    if "vendor" in payload.model_fields_set:
-        device.vendor = payload.vendor
-    if "model" in payload.model_fields_set:
-        device.model = payload.model
-    if "serial" in payload.model_fields_set:
-        device.serial = payload.serial
-    if "notes" in payload.model_fields_set:
-        device.notes = payload.notes
-
-    current_is_receiver = device.is_receiver
-    next_is_receiver = current_is_receiver
-    if "is_receiver" in payload.model_fields_set:
-        next_is_receiver = bool(payload.is_receiver)
 
+    next_is_receiver = device.is_receiver
     next_capabilities = _collect_receiver_capabilities(device)
-    for field in RECEIVER_CAPABILITY_FIELDS:
-        if field in payload.model_fields_set:
-            next_capabilities[field] = bool(getattr(payload, field))
+    # Only the fields the client actually sent are visited, in one dict walk.
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        bit = _CAPABILITY_BIT_BY_FIELD.get(field)
+        if bit is not None:
+            next_capabilities = next_capabilities | bit if value else next_capabilities & ~bit
+        elif field == "is_receiver":
+            next_is_receiver = bool(value)
+        elif field in _OPTIONAL_PATCH_FIELDS or (field in _REQUIRED_PATCH_FIELDS and value is not None):
+            setattr(device, field, value)
 
     normalized_receiver, normalized_capabilities = _normalize_receiver_payload(next_is_receiver, next_capabilities)
     device.is_receiver = normalized_receiver
@@ -290,7 +363,6 @@ def update_device(
 
     db.add(device)
     db.commit()
-    db.refresh(device)
 
     return _device_to_summary(device)
 
@@ -315,7 +387,6 @@ def create_interface(
     )
     db.add(interface)
     db.commit()
-    db.refresh(interface)
 
     return _interface_to_response(interface)
 
@@ -330,9 +401,13 @@ def delete_device(
     if device is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Device not found")
 
-    interface_dependencies = db.scalar(select(func.count(Interface.id)).where(Interface.device_id == device.id)) or 0
-    receiver_dependencies = db.scalar(select(func.count(Connection.id)).where(Connection.receiver_id == device.id)) or 0
-    secret_dependencies = db.scalar(select(func.count(Secret.id)).where(Secret.linked_device_id == device.id)) or 0
+    interface_dependencies, receiver_dependencies, secret_dependencies = db.execute(
+        select(
+            select(func.count(Interface.id)).where(Interface.device_id == device.id).scalar_subquery(),
+            select(func.count(Connection.id)).where(Connection.receiver_id == device.id).scalar_subquery(),
+            select(func.count(Secret.id)).where(Secret.linked_device_id == device.id).scalar_subquery(),
+        )
+    ).one()
     if interface_dependencies or receiver_dependencies or secret_dependencies:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
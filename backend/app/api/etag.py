@@ -0,0 +1,63 @@
+from collections.abc import Callable
+import hashlib
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+
+def _etag_for_bytes(content: bytes) -> str:
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_for(model: BaseModel) -> str:
+    return _etag_for_bytes(model.model_dump_json().encode("utf-8"))
+
+
+def etag_for_parts(*parts: object) -> str:
+    # For output derived deterministically from plain values (UUIDs, enums, column rows).
+    return _etag_for_bytes(repr(parts).encode("utf-8"))
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    # Authenticated responses may be revalidated by the browser but never shared.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(request: Request, etag: str) -> Response | None:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+    return None
+
+
+def conditional_response(request: Request, response: Response, model: BaseModel) -> BaseModel | Response:
+    etag = etag_for(model)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    response.headers.update(_cache_headers(etag))
+    return model
+
+
+def conditional_json_response(request: Request, content: bytes) -> Response:
+    etag = _etag_for_bytes(content)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    return Response(content=content, media_type="application/json", headers=_cache_headers(etag))
+
+
+def conditional_rendered_response(request: Request, etag: str, render: Callable[[], bytes], media_type: str) -> Response:
+    # The ETag is computed from the inputs, so a matching client skips rendering too.
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    return Response(content=render(), media_type=media_type, headers=_cache_headers(etag))
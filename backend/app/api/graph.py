@@ -1,13 +1,14 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.orm import Session, aliased
 
 from app.api.deps import require_user
-from app.api.root_access import ensure_root_exists, require_root_access
+from app.api.etag import conditional_json_response
+from app.api.root_access import require_accessible_root
 from app.db.session import get_db
 from app.models.connection import Connection, ConnectionTechnology
 from app.models.device import Device
@@ -47,52 +48,54 @@ class GraphResponse(BaseModel):
 
 @router.get("", response_model=GraphResponse)
 def graph(
+    request: Request,
     root_id: UUID = Query(...),
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
-) -> GraphResponse:
-    require_root_access(db, current_user, root_id)
-    ensure_root_exists(db, root_id)
+) -> Response:
+    require_accessible_root(db, current_user, root_id)
 
-    devices = db.scalars(select(Device).where(Device.root_id == root_id).order_by(Device.name.asc())).all()
+    # Plain column rows: no ORM instance state is built for what is only serialized.
+    devices = db.execute(
+        select(
+            Device.id,
+            Device.name,
+            Device.type,
+            Device.space_id,
+            Device.vendor,
+            Device.model,
+            Device.created_at,
+        )
+        .where(Device.root_id == root_id)
+        .order_by(Device.name.asc())
+    ).all()
 
     from_interface = aliased(Interface)
     to_interface = aliased(Interface)
 
-    rows = db.execute(
-        select(Connection, from_interface.device_id.label("from_device_id"), to_interface.device_id.label("to_device_id"))
+    connections = db.execute(
+        select(
+            Connection.id,
+            from_interface.device_id.label("from_device_id"),
+            to_interface.device_id.label("to_device_id"),
+            Connection.from_interface_id,
+            Connection.to_interface_id,
+            Connection.receiver_id,
+            Connection.technology,
+            Connection.vlan_id,
+            Connection.notes,
+            Connection.created_at,
+        )
         .join(from_interface, Connection.from_interface_id == from_interface.id)
         .join(to_interface, Connection.to_interface_id == to_interface.id)
         .where(Connection.root_id == root_id)
         .order_by(Connection.created_at.asc())
     ).all()
 
-    return GraphResponse(
-        devices=[
-            GraphDeviceNode(
-                id=device.id,
-                name=device.name,
-                type=device.type,
-                space_id=device.space_id,
-                vendor=device.vendor,
-                model=device.model,
-                created_at=device.created_at,
-            )
-            for device in devices
-        ],
-        connections=[
-            GraphConnectionEdge(
-                id=row[0].id,
-                from_device_id=row[1],
-                to_device_id=row[2],
-                from_interface_id=row[0].from_interface_id,
-                to_interface_id=row[0].to_interface_id,
-                receiver_id=row[0].receiver_id,
-                technology=row[0].technology,
-                vlan_id=row[0].vlan_id,
-                notes=row[0].notes,
-                created_at=row[0].created_at,
-            )
-            for row in rows
-        ],
+    # Everything below is read straight from typed columns; skip re-validation,
+    # including FastAPI's response_model pass, by serializing the body here.
+    body = GraphResponse.model_construct(
+        devices=[GraphDeviceNode.model_construct(**row._mapping) for row in devices],
+        connections=[GraphConnectionEdge.model_construct(**row._mapping) for row in connections],
     )
+    return conditional_json_response(request, body.model_dump_json().encode("utf-8"))
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import datetime
-import uuid
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import func, select
+from sqlalchemy import Row, exists, func, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_admin, require_user
-from app.api.root_access import ensure_root_exists, get_accessible_root_ids, require_root_access
+from app.api.etag import conditional_json_response
+from app.api.root_access import ensure_root_exists, forget_root, get_accessible_roots, require_accessible_root
 from app.db.session import get_db
+from app.db.uuid7 import uuid7
 from app.models.connection import Connection
 from app.models.device import Device
 from app.models.location import Location
@@ -99,62 +101,73 @@ def _validate_parent_for_root(db: Session, root_id: UUID, parent_id: UUID) -> Lo
 
 
 def _creates_cycle(db: Session, location_id: UUID, new_parent_id: UUID | None) -> bool:
-    current_parent = new_parent_id
-    while current_parent is not None:
-        if current_parent == location_id:
-            return True
-        current_parent = db.scalar(select(Location.parent_id).where(Location.id == current_parent).limit(1))
-    return False
+    if new_parent_id is None:
+        return False
+    if new_parent_id == location_id:
+        return True
+
+    # Walk every ancestor of the new parent in one recursive query; UNION (not
+    # UNION ALL) also terminates if the stored tree already contains a cycle.
+    ancestors = (
+        select(Location.id, Location.parent_id).where(Location.id == new_parent_id).cte("ancestors", recursive=True)
+    )
+    ancestors = ancestors.union(
+        select(Location.id, Location.parent_id).join(ancestors, Location.id == ancestors.c.parent_id)
+    )
+    return bool(db.scalar(select(exists().where(ancestors.c.id == location_id))))
 
 
-def _build_tree(locations: list[Location], root_id: UUID, device_counts: dict[UUID, int]) -> LocationTreeNode:
-    nodes = {
-        location.id: LocationTreeNode(
-            id=location.id,
-            name=location.name,
-            parent_id=location.parent_id,
-            root_id=location.root_id,
-            notes=location.notes,
-            created_at=location.created_at,
-            device_count=device_counts.get(location.id, 0),
-            children=[],
-        )
-        for location in locations
-    }
+def _to_tree_node(location: Location, device_counts: dict[UUID, int]) -> LocationTreeNode:
+    return LocationTreeNode.model_construct(
+        id=location.id,
+        name=location.name,
+        parent_id=location.parent_id,
+        root_id=location.root_id,
+        notes=location.notes,
+        created_at=location.created_at,
+        device_count=device_counts.get(location.id, 0),
+        children=[],
+    )
 
+
+def _build_tree(locations: list[Location], root_id: UUID, device_counts: dict[UUID, int]) -> LocationTreeNode:
+    root_location = None
+    children_by_parent: defaultdict[UUID, list[Location]] = defaultdict(list)
     for location in locations:
         if location.id == root_id:
-            continue
-        if location.parent_id is None:
-            continue
-        parent = nodes.get(location.parent_id)
-        if parent is not None:
-            parent.children.append(nodes[location.id])
-
-    def sort_children(node: LocationTreeNode) -> None:
-        node.children.sort(key=lambda child: child.name.lower())
-        for child in node.children:
-            sort_children(child)
-
-    root_node = nodes.get(root_id)
-    if root_node is None:
+            root_location = location
+        elif location.parent_id is not None:
+            children_by_parent[location.parent_id].append(location)
+
+    if root_location is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Root tree not found")
 
-    sort_children(root_node)
+    # Nodes are created only as the walk reaches them, so orphaned rows are skipped;
+    # an explicit stack keeps deep trees clear of the recursion limit.
+    root_node = _to_tree_node(root_location, device_counts)
+    stack = [root_node]
+    while stack:
+        node = stack.pop()
+        children = sorted(children_by_parent.get(node.id, ()), key=lambda child: child.name.lower())
+        node.children = [_to_tree_node(child, device_counts) for child in children]
+        stack.extend(node.children)
     return root_node
 
 
-def _to_root_response(root: Location) -> RootResponse:
-    return RootResponse(id=root.id, name=root.name, notes=root.notes, created_at=root.created_at)
+def _apply_name_and_notes(location: Location, changes: dict[str, object]) -> None:
+    # PATCH semantics: an explicit null clears notes but never the name.
+    for field, value in changes.items():
+        if value is not None or field == "notes":
+            setattr(location, field, value)
+
+
+def _to_root_response(root: Location | Row) -> RootResponse:
+    return RootResponse.model_construct(id=root.id, name=root.name, notes=root.notes, created_at=root.created_at)
 
 
 @router.get("/roots", response_model=list[RootResponse])
 def list_roots(current_user: User = Depends(require_user), db: Session = Depends(get_db)) -> list[RootResponse]:
-    accessible_root_ids = get_accessible_root_ids(db, current_user)
-    if not accessible_root_ids:
-        return []
-
-    roots = db.scalars(select(Location).where(Location.id.in_(accessible_root_ids))).all()
+    roots = get_accessible_roots(db, current_user)
     return [_to_root_response(root) for root in sorted(roots, key=lambda item: item.name.lower())]
 
 
@@ -164,7 +177,7 @@ def create_root(
     _: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ) -> RootResponse:
-    root_id = uuid.uuid4()
+    root_id = uuid7()
     root = Location(
         id=root_id,
         name=payload.name,
@@ -174,7 +187,6 @@ def create_root(
     )
     db.add(root)
     db.commit()
-    db.refresh(root)
     return _to_root_response(root)
 
 
@@ -186,14 +198,10 @@ def update_root(
     db: Session = Depends(get_db),
 ) -> RootResponse:
     root = ensure_root_exists(db, root_id)
-    if payload.name is not None:
-        root.name = payload.name
-    if "notes" in payload.model_fields_set:
-        root.notes = payload.notes
+    _apply_name_and_notes(root, payload.model_dump(exclude_unset=True))
 
     db.add(root)
     db.commit()
-    db.refresh(root)
     return _to_root_response(root)
 
 
@@ -237,30 +245,32 @@ def delete_root(
 
     db.delete(root)
     db.commit()
+    forget_root(root_id)
     return {"status": "ok"}
 
 
 @router.get("/locations/tree", response_model=LocationTreeNode)
 def locations_tree(
+    request: Request,
     root_id: UUID = Query(...),
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
-) -> LocationTreeNode:
-    require_root_access(db, current_user, root_id)
-    ensure_root_exists(db, root_id)
-
-    locations = db.scalars(select(Location).where(Location.root_id == root_id)).all()
-    if not locations:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Root tree not found")
-
-    counts = db.execute(
-        select(Device.space_id, func.count(Device.id))
-        .where(Device.root_id == root_id)
-        .group_by(Device.space_id)
+) -> Response:
+    require_accessible_root(db, current_user, root_id)
+
+    rows = db.execute(
+        select(Location, func.count(Device.id))
+        .outerjoin(Device, Device.space_id == Location.id)
+        .where(Location.root_id == root_id)
+        .group_by(Location.id)
     ).all()
-    device_counts = {space_id: count for space_id, count in counts}
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Root tree not found")
 
-    return _build_tree(locations, root_id, device_counts)
+    locations = [location for location, _ in rows]
+    device_counts = {location.id: count for location, count in rows}
+    tree = _build_tree(locations, root_id, device_counts)
+    return conditional_json_response(request, tree.model_dump_json().encode("utf-8"))
 
 
 @router.post("/locations", response_model=LocationSummary, status_code=status.HTTP_201_CREATED)
@@ -282,7 +292,6 @@ def create_location(
     )
     db.add(location)
     db.commit()
-    db.refresh(location)
 
     return LocationSummary(
         id=location.id,
@@ -306,11 +315,7 @@ def update_location(
     if location is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Location not found")
 
-    if payload.name is not None:
-        location.name = payload.name
-
-    if "notes" in payload.model_fields_set:
-        location.notes = payload.notes
+    _apply_name_and_notes(location, payload.model_dump(exclude_unset=True, exclude={"parent_id"}))
 
     if "parent_id" in payload.model_fields_set:
         if location.id == location.root_id and payload.parent_id is not None:
@@ -340,7 +345,6 @@ def update_location(
 
     db.add(location)
     db.commit()
-    db.refresh(location)
 
     return LocationSummary(
         id=location.id,
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+
+from fastapi import Query
+from sqlalchemy import Select
+
+MAX_PAGE_LIMIT = 500
+
+
+@dataclass(frozen=True)
+class Page:
+    limit: int | None
+    offset: int
+
+
+def page_params(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_LIMIT),
+    offset: int = Query(default=0, ge=0),
+) -> Page:
+    # Without a limit the full list is returned, as before pagination existed.
+    return Page(limit=limit, offset=offset)
+
+
+def apply_page(query: Select, page: Page) -> Select:
+    return query.limit(page.limit).offset(page.offset or None)
@@ -1,18 +1,55 @@
+from collections import OrderedDict
+import threading
+import time
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Row, bindparam, exists, select
 from sqlalchemy.orm import Session
 
 from app.models.location import Location
 from app.models.user import User, UserRole
 from app.models.user_root import UserRoot
 
+# Root ids confirmed to exist, kept briefly so read endpoints that only need
+# an existence check skip the lookup. Only positive results are cached, and
+# delete_root evicts its id; other API processes may trail by up to the TTL,
+# so inserts keep the uncached ensure_root_exists.
+ROOT_CACHE_MAX_ENTRIES = 1024
+ROOT_CACHE_TTL_SECONDS = 30
 
-def get_accessible_root_ids(db: Session, user: User) -> set[UUID]:
+_known_roots: OrderedDict[UUID, float] = OrderedDict()
+_known_roots_lock = threading.Lock()
+
+_ROOT_SUMMARY_COLUMNS = (Location.id, Location.name, Location.notes, Location.created_at)
+_ALL_ROOTS_STMT = select(*_ROOT_SUMMARY_COLUMNS).where(Location.id == Location.root_id)
+_USER_ROOTS_STMT = (
+    select(*_ROOT_SUMMARY_COLUMNS)
+    .join(UserRoot, UserRoot.root_id == Location.id)
+    .where(UserRoot.user_id == bindparam("user_id"), Location.id == Location.root_id)
+)
+_ADMIN_ROOT_ACCESS_STMT = (
+    select(Location.id).where(Location.id == bindparam("root_id"), Location.id == Location.root_id).limit(1)
+)
+_USER_ROOT_ACCESS_STMT = (
+    select(UserRoot.root_id)
+    .where(UserRoot.user_id == bindparam("user_id"), UserRoot.root_id == bindparam("root_id"))
+    .limit(1)
+)
+_USER_ROOT_WITH_ACCESS_STMT = select(
+    Location,
+    exists()
+    .where(UserRoot.user_id == bindparam("user_id"), UserRoot.root_id == Location.id)
+    .label("has_access"),
+).where(Location.id == bindparam("root_id"))
+
+
+def get_accessible_roots(db: Session, user: User) -> list[Row]:
+    # Rows carry only id, name, notes and created_at. Admins see every root without
+    # touching user_roots; users get theirs through one join.
     if user.role == UserRole.ADMIN:
-        return set(db.scalars(select(Location.id).where(Location.id == Location.root_id)).all())
-    return set(db.scalars(select(UserRoot.root_id).where(UserRoot.user_id == user.id)).all())
+        return list(db.execute(_ALL_ROOTS_STMT).all())
+    return list(db.execute(_USER_ROOTS_STMT, {"user_id": user.id}).all())
 
 
 def ensure_root_exists(db: Session, root_id: UUID) -> Location:
@@ -22,6 +59,55 @@ def ensure_root_exists(db: Session, root_id: UUID) -> Location:
     return root
 
 
+def ensure_root_id_exists(db: Session, root_id: UUID) -> None:
+    now = time.monotonic()
+    with _known_roots_lock:
+        expires_at = _known_roots.get(root_id)
+        if expires_at is not None:
+            if expires_at > now:
+                _known_roots.move_to_end(root_id)
+                return
+            del _known_roots[root_id]
+
+    ensure_root_exists(db, root_id)
+    with _known_roots_lock:
+        _known_roots[root_id] = now + ROOT_CACHE_TTL_SECONDS
+        _known_roots.move_to_end(root_id)
+        while len(_known_roots) > ROOT_CACHE_MAX_ENTRIES:
+            _known_roots.popitem(last=False)
+
+
+def forget_root(root_id: UUID) -> None:
+    with _known_roots_lock:
+        _known_roots.pop(root_id, None)
+
+
+def user_has_root_access(db: Session, user: User, root_id: UUID) -> bool:
+    # Probes a single root instead of materializing every accessible id.
+    if user.role == UserRole.ADMIN:
+        return db.scalar(_ADMIN_ROOT_ACCESS_STMT, {"root_id": root_id}) is not None
+    return db.scalar(_USER_ROOT_ACCESS_STMT, {"user_id": user.id, "root_id": root_id}) is not None
+
+
 def require_root_access(db: Session, user: User, root_id: UUID) -> None:
-    if root_id not in get_accessible_root_ids(db, user):
+    if not user_has_root_access(db, user, root_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to this root")
+
+
+def require_accessible_root(db: Session, user: User, root_id: UUID) -> Location:
+    if user.role == UserRole.ADMIN:
+        # Admins may access every root, so loading it is the whole access check.
+        root = db.get(Location, root_id)
+        if root is None or root.id != root.root_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to this root")
+        return root
+
+    # One round-trip loads the location and the user's assignment together. A
+    # missing row means 403: assignments can only reference existing locations.
+    row = db.execute(_USER_ROOT_WITH_ACCESS_STMT, {"user_id": user.id, "root_id": root_id}).first()
+    if row is None or not row.has_access:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No access to this root")
+    root = row[0]
+    if root.id != root.root_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Root not found")
+    return root
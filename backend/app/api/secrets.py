@@ -1,13 +1,13 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_admin
-from app.api.root_access import ensure_root_exists
+from app.api.root_access import ensure_root_exists, ensure_root_id_exists
 from app.core.crypto import decrypt_secret, encrypt_secret
 from app.db.session import get_db
 from app.models.device import Device
@@ -27,6 +27,13 @@ class SecretResponse(BaseModel):
     created_at: datetime
 
 
+_SECRET_LIST_ADAPTER = TypeAdapter(list[SecretResponse])
+# No row means the device is missing, False means it belongs to another root.
+_DEVICE_IN_ROOT_STMT = select((Device.root_id == bindparam("root_id")).label("same_root")).where(
+    Device.id == bindparam("device_id")
+)
+
+
 class CreateSecretRequest(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
@@ -45,10 +52,10 @@ class RevealSecretResponse(BaseModel):
 def _validate_linked_device(db: Session, root_id: UUID, linked_device_id: UUID | None) -> None:
     if linked_device_id is None:
         return
-    device = db.get(Device, linked_device_id)
-    if device is None:
+    same_root = db.scalar(_DEVICE_IN_ROOT_STMT, {"device_id": linked_device_id, "root_id": root_id})
+    if same_root is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Linked device not found")
-    if device.root_id != root_id:
+    if not same_root:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Linked device must belong to root")
 
 
@@ -57,12 +64,12 @@ def list_secrets(
     root_id: UUID = Query(...),
     _: User = Depends(require_admin),
     db: Session = Depends(get_db),
-) -> list[SecretResponse]:
-    ensure_root_exists(db, root_id)
+) -> Response:
+    ensure_root_id_exists(db, root_id)
 
     secrets = db.scalars(select(Secret).where(Secret.root_id == root_id).order_by(Secret.created_at.desc())).all()
-    return [
-        SecretResponse(
+    items = [
+        SecretResponse.model_construct(
             id=secret.id,
             root_id=secret.root_id,
             type=secret.type,
@@ -73,6 +80,7 @@ def list_secrets(
         )
         for secret in secrets
     ]
+    return Response(content=_SECRET_LIST_ADAPTER.dump_json(items), media_type="application/json")
 
 
 @router.post("", response_model=SecretResponse, status_code=status.HTTP_201_CREATED)
@@ -94,9 +102,8 @@ def create_secret(
     )
     db.add(secret)
     db.commit()
-    db.refresh(secret)
 
-    return SecretResponse(
+    return SecretResponse.model_construct(
         id=secret.id,
         root_id=secret.root_id,
         type=secret.type,
@@ -8,12 +8,16 @@ from sqlalchemy.orm import Session
 
 from app.core.security import PASSWORD_POLICY_MESSAGE, hash_password, validate_password_policy
 from app.db.session import get_db
+from app.db.uuid7 import uuid7
 from app.models.location import Location
 from app.models.user import User, UserRole
 from app.models.user_root import UserRoot
 
 router = APIRouter(prefix="/setup", tags=["setup"])
 
+# Existence probe: stops at the first admin id, read from the partial ix_users_admin index.
+_ADMIN_EXISTS_STMT = select(User.id).where(User.role == UserRole.ADMIN).limit(1)
+
 
 class SetupStatusResponse(BaseModel):
     needs_setup: bool
@@ -33,8 +37,7 @@ class SetupAdminResponse(BaseModel):
 
 
 def _needs_setup(db: Session) -> bool:
-    admin_exists = db.scalar(select(User.id).where(User.role == UserRole.ADMIN).limit(1))
-    return admin_exists is None
+    return db.scalar(_ADMIN_EXISTS_STMT) is None
 
 
 @router.get("/status", response_model=SetupStatusResponse)
@@ -50,9 +53,9 @@ def create_first_admin(payload: SetupAdminRequest, db: Session = Depends(get_db)
     if not validate_password_policy(payload.password):
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=PASSWORD_POLICY_MESSAGE)
 
-    root_id = uuid.uuid4()
+    root_id = uuid7()
     admin = User(
-        email=payload.email.lower(),
+        email=payload.email,
         password_hash=hash_password(payload.password),
         role=UserRole.ADMIN,
         is_active=True,
@@ -75,6 +78,5 @@ def create_first_admin(payload: SetupAdminRequest, db: Session = Depends(get_db)
 
     db.add(UserRoot(user_id=admin.id, root_id=root_id))
     db.commit()
-    db.refresh(admin)
 
     return SetupAdminResponse(id=admin.id, email=admin.email, role=admin.role)
@@ -3,11 +3,12 @@ from fastapi import APIRouter
 router = APIRouter()
 
 
+# No I/O here, so these run on the event loop instead of hopping to a worker thread.
 @router.get("/health")
-def health() -> dict[str, str]:
+async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
 @router.get("/version")
-def version() -> str:
+async def version() -> str:
     return "0.1.0"
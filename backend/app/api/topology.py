@@ -1,14 +1,20 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import lru_cache
 import io
+import math
+import threading
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import Response
 from PIL import Image, ImageDraw, ImageFont
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session, aliased
 
 from app.api.deps import require_user
-from app.api.root_access import ensure_root_exists, require_root_access
+from app.api.etag import conditional_rendered_response, etag_for_parts
+from app.api.root_access import require_accessible_root
 from app.db.session import get_db
 from app.models.connection import Connection
 from app.models.device import Device
@@ -17,51 +23,156 @@ from app.models.user import User
 
 router = APIRouter(prefix="/topology", tags=["topology"])
 
+# Loaded and parsed once; RGB tuples skip Pillow's color-string parsing per call.
+_FONT = ImageFont.load_default()
+_BACKGROUND = (0xF8, 0xFA, 0xFC)
+_HEADER = (0x0F, 0x17, 0x2A)
+_HEADER_TEXT = (0xFF, 0xFF, 0xFF)
+_TEXT = (0x1E, 0x29, 0x3B)
+_LINE_HEIGHT = sum(_FONT.getmetrics())
+_WIDTH = 1500
+_CHROME_HEIGHT = 110
+_SPACE_ADVANCE = _FONT.getlength(" ")
+
+# Rendered PNGs keyed by the ETag of everything they draw, so an unchanged
+# topology is served without touching Pillow. Entries can never be stale.
+TOPOLOGY_CACHE_MAX_ENTRIES = 32
+
+_rendered_pngs: OrderedDict[str, bytes] = OrderedDict()
+_rendered_pngs_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def _glyph(char: str) -> tuple[Image.Image, int, float]:
+    # Each character is rasterized once per process; the mask is widened on the
+    # left for glyphs with negative bearing so nothing is clipped.
+    advance = _FONT.getlength(char)
+    left, _, right, _ = _FONT.getbbox(char)
+    left = min(left, 0)
+    mask = Image.new("L", (max(right, math.ceil(advance), 1) - left, _LINE_HEIGHT))
+    ImageDraw.Draw(mask).text((-left, 0), char, fill=255, font=_FONT)
+    return mask, left, advance
+
+
+@lru_cache(maxsize=4096)
+def _word(word: str) -> tuple[Image.Image, int, float]:
+    # Words repeat heavily across rows ("->", "|", technologies, interface
+    # names), so each is composed from glyph masks once and pasted whole.
+    placed = []
+    x = 0.0
+    for char in word:
+        mask, left, advance = _glyph(char)
+        placed.append((mask, round(x) + left))
+        x += advance
+    left = min(offset for _, offset in placed)
+    width = max(offset + mask.width for mask, offset in placed) - left
+    word_mask = Image.new("L", (width, _LINE_HEIGHT))
+    for mask, offset in placed:
+        word_mask.paste(255, (offset - left, 0), mask)
+    return word_mask, left, x
+
+
+def _draw_text(image: Image.Image, xy: tuple[int, int], text: str, fill: tuple[int, int, int]) -> None:
+    # Pastes cached word masks instead of laying out the whole line with FreeType.
+    x, y = xy
+    for index, word in enumerate(text.split(" ")):
+        if index:
+            x += _SPACE_ADVANCE
+        if word:
+            mask, left, advance = _word(word)
+            image.paste(fill, (round(x) + left, y), mask)
+            x += advance
+
+
+@lru_cache(maxsize=1)
+def _chrome() -> Image.Image:
+    # The header bar and column titles are identical on every image; only the
+    # root id in the header is drawn per request.
+    chrome = Image.new("RGB", (_WIDTH, _CHROME_HEIGHT), color=_BACKGROUND)
+    ImageDraw.Draw(chrome).rectangle((20, 20, _WIDTH - 20, 60), fill=_HEADER)
+    _draw_text(chrome, (30, 80), "Devices", _HEADER)
+    _draw_text(chrome, (760, 80), "Connections", _HEADER)
+    return chrome
+
+
+def _cached_png(etag: str, root_id: UUID, devices: Sequence[Row], rows: Sequence[Row]) -> bytes:
+    with _rendered_pngs_lock:
+        content = _rendered_pngs.get(etag)
+        if content is not None:
+            _rendered_pngs.move_to_end(etag)
+            return content
+
+    content = _render_png(root_id, devices, rows)
+    with _rendered_pngs_lock:
+        _rendered_pngs[etag] = content
+        while len(_rendered_pngs) > TOPOLOGY_CACHE_MAX_ENTRIES:
+            _rendered_pngs.popitem(last=False)
+    return content
+
 
 @router.get("/png")
 def topology_png(
+    request: Request,
     root_id: UUID = Query(...),
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
 ) -> Response:
-    require_root_access(db, current_user, root_id)
-    ensure_root_exists(db, root_id)
+    require_accessible_root(db, current_user, root_id)
 
-    devices = db.scalars(select(Device).where(Device.root_id == root_id).order_by(Device.name.asc())).all()
+    devices = db.execute(
+        select(
+            Device.name,
+            Device.type,
+            Device.is_receiver,
+            Device.supports_zigbee,
+            Device.supports_matter_thread,
+            Device.supports_bluetooth,
+            Device.supports_ble,
+            Device.supports_wifi,
+            Device.supports_ethernet,
+        )
+        .where(Device.root_id == root_id)
+        .order_by(Device.name.asc())
+    ).all()
 
+    # Device names come from the same round-trip, so the two lists are independent.
     from_interface = aliased(Interface)
     to_interface = aliased(Interface)
+    from_device = aliased(Device)
+    to_device = aliased(Device)
+    receiver_device = aliased(Device)
     rows = db.execute(
         select(
-            Connection,
-            from_interface.device_id.label("from_device_id"),
-            to_interface.device_id.label("to_device_id"),
+            from_device.name.label("from_device_name"),
+            to_device.name.label("to_device_name"),
+            receiver_device.name.label("receiver_name"),
             from_interface.name.label("from_interface_name"),
             to_interface.name.label("to_interface_name"),
+            Connection.technology,
+            Connection.vlan_id,
         )
         .join(from_interface, Connection.from_interface_id == from_interface.id)
         .join(to_interface, Connection.to_interface_id == to_interface.id)
+        .join(from_device, from_interface.device_id == from_device.id)
+        .join(to_device, to_interface.device_id == to_device.id)
+        .outerjoin(receiver_device, Connection.receiver_id == receiver_device.id)
         .where(Connection.root_id == root_id)
         .order_by(Connection.created_at.asc())
     ).all()
 
-    width = 1500
-    max_rows = max(len(devices), len(rows), 1)
-    height = 160 + max_rows * 32
-
-    image = Image.new("RGB", (width, height), color="#f8fafc")
-    draw = ImageDraw.Draw(image)
-    font = ImageFont.load_default()
+    etag = etag_for_parts(root_id, [tuple(device) for device in devices], [tuple(row) for row in rows])
+    return conditional_rendered_response(request, etag, lambda: _cached_png(etag, root_id, devices, rows), "image/png")
 
-    draw.rectangle((20, 20, width - 20, 60), fill="#0f172a")
-    draw.text((30, 34), f"Hardware Registry Topology (root: {root_id})", fill="#ffffff", font=font)
 
-    draw.text((30, 80), "Devices", fill="#0f172a", font=font)
-    draw.text((760, 80), "Connections", fill="#0f172a", font=font)
+def _render_png(root_id: UUID, devices: Sequence[Row], rows: Sequence[Row]) -> bytes:
+    max_rows = max(len(devices), len(rows), 1)
+    height = 160 + max_rows * 32
 
-    device_name_by_id = {device.id: device.name for device in devices}
+    image = Image.new("RGB", (_WIDTH, height), color=_BACKGROUND)
+    image.paste(_chrome(), (0, 0))
+    _draw_text(image, (30, 34), f"Hardware Registry Topology (root: {root_id})", _HEADER_TEXT)
 
-    y = 110
+    y = _CHROME_HEIGHT
     for index, device in enumerate(devices, start=1):
         capabilities = []
         if device.is_receiver:
@@ -83,24 +194,22 @@ def topology_png(
             receiver_suffix = f" [receiver: {', '.join(capabilities) if capabilities else 'yes'}]"
 
         line = f"{index:02d}. {device.name} ({device.type}){receiver_suffix}"
-        draw.text((30, y), line, fill="#1e293b", font=font)
+        _draw_text(image, (30, y), line, _TEXT)
         y += 30
 
-    y = 110
+    y = _CHROME_HEIGHT
     for index, row in enumerate(rows, start=1):
-        connection = row[0]
-        from_device = device_name_by_id.get(row[1], str(row[1]))
-        to_device = device_name_by_id.get(row[2], str(row[2]))
-        receiver = device_name_by_id.get(connection.receiver_id, "-") if connection.receiver_id else "-"
-        vlan = connection.vlan_id if connection.vlan_id else "-"
+        receiver = row.receiver_name or "-"
+        vlan = row.vlan_id if row.vlan_id else "-"
         line = (
-            f"{index:02d}. {from_device}:{row[3]} -> {to_device}:{row[4]} | "
-            f"{connection.technology.value} | VLAN: {vlan} | RX: {receiver}"
+            f"{index:02d}. {row.from_device_name}:{row.from_interface_name} -> "
+            f"{row.to_device_name}:{row.to_interface_name} | "
+            f"{row.technology.value} | VLAN: {vlan} | RX: {receiver}"
         )
-        draw.text((760, y), line, fill="#1e293b", font=font)
+        _draw_text(image, (760, y), line, _TEXT)
         y += 30
 
     output = io.BytesIO()
-    image.save(output, format="PNG")
-    output.seek(0)
-    return Response(content=output.read(), media_type="image/png")
+    # Flat diagram colors compress well even at the fastest zlib level.
+    image.save(output, format="PNG", compress_level=1)
+    return output.getvalue()
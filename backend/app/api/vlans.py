@@ -1,15 +1,16 @@
 from datetime import datetime
+from functools import lru_cache
 import ipaddress
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from sqlalchemy import exists, func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_admin, require_user
-from app.api.root_access import ensure_root_exists, require_root_access
+from app.api.root_access import ensure_root_exists, require_accessible_root
 from app.models.connection import Connection
 from app.db.session import get_db
 from app.models.user import User
@@ -29,6 +30,9 @@ class VlanResponse(BaseModel):
     created_at: datetime
 
 
+_VLAN_LIST_ADAPTER = TypeAdapter(list[VlanResponse])
+
+
 class CreateVlanRequest(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
@@ -48,12 +52,17 @@ class UpdateVlanRequest(BaseModel):
     notes: str | None = None
 
 
+@lru_cache(maxsize=1024)
+def _parse_cidr(cidr: str) -> str:
+    # Pure, so memoizing is safe; invalid input raises and is not cached.
+    return str(ipaddress.ip_network(cidr, strict=True))
+
+
 def _normalize_cidr(cidr: str) -> str:
     try:
-        network = ipaddress.ip_network(cidr, strict=True)
+        return _parse_cidr(cidr)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid CIDR format") from exc
-    return str(network)
 
 
 @router.get("", response_model=list[VlanResponse])
@@ -61,23 +70,17 @@ def list_vlans(
     root_id: UUID = Query(...),
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
-) -> list[VlanResponse]:
-    require_root_access(db, current_user, root_id)
-    ensure_root_exists(db, root_id)
-
-    vlans = db.scalars(select(Vlan).where(Vlan.root_id == root_id).order_by(Vlan.vlan_id.asc(), Vlan.name.asc())).all()
-    return [
-        VlanResponse(
-            id=vlan.id,
-            root_id=vlan.root_id,
-            vlan_id=vlan.vlan_id,
-            name=vlan.name,
-            cidr=vlan.cidr,
-            notes=vlan.notes,
-            created_at=vlan.created_at,
-        )
-        for vlan in vlans
-    ]
+) -> Response:
+    require_accessible_root(db, current_user, root_id)
+
+    # Only the response columns, as plain rows: nothing here can lazy-load.
+    rows = db.execute(
+        select(Vlan.id, Vlan.root_id, Vlan.vlan_id, Vlan.name, Vlan.cidr, Vlan.notes, Vlan.created_at)
+        .where(Vlan.root_id == root_id)
+        .order_by(Vlan.vlan_id.asc(), Vlan.name.asc())
+    ).all()
+    items = [VlanResponse.model_construct(**row._mapping) for row in rows]
+    return Response(content=_VLAN_LIST_ADAPTER.dump_json(items), media_type="application/json")
 
 
 @router.post("", response_model=VlanResponse, status_code=status.HTTP_201_CREATED)
@@ -103,7 +106,6 @@ def create_vlan(
         db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="VLAN already exists in this root") from exc
 
-    db.refresh(vlan)
     return VlanResponse(
         id=vlan.id,
         root_id=vlan.root_id,
@@ -144,7 +146,6 @@ def update_vlan(
         db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="VLAN already exists in this root") from exc
 
-    db.refresh(vlan)
     return VlanResponse(
         id=vlan.id,
         root_id=vlan.root_id,
@@ -166,9 +167,17 @@ def delete_vlan(
     if vlan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="VLAN not found")
 
-    wifi_dependencies = db.scalar(select(func.count(WifiNetwork.id)).where(WifiNetwork.vlan_id == vlan.id)) or 0
-    connection_dependencies = db.scalar(select(func.count(Connection.id)).where(Connection.vlan_id == vlan.id)) or 0
-    if wifi_dependencies or connection_dependencies:
+    # EXISTS stops at the first linked row; counts are only needed for the 409 message.
+    has_dependencies = db.scalar(
+        select(or_(exists().where(WifiNetwork.vlan_id == vlan.id), exists().where(Connection.vlan_id == vlan.id)))
+    )
+    if has_dependencies:
+        wifi_dependencies, connection_dependencies = db.execute(
+            select(
+                select(func.count(WifiNetwork.id)).where(WifiNetwork.vlan_id == vlan.id).scalar_subquery(),
+                select(func.count(Connection.id)).where(Connection.vlan_id == vlan.id).scalar_subquery(),
+            )
+        ).one()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=(
@@ -1,13 +1,14 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_admin, require_user
-from app.api.root_access import ensure_root_exists, require_root_access
+from app.api.root_access import require_accessible_root, require_root_access
 from app.core.crypto import decrypt_secret, encrypt_secret
 from app.db.session import get_db
 from app.models.location import Location
@@ -17,6 +18,26 @@ from app.models.wifi_network import WifiNetwork
 
 router = APIRouter(prefix="/wifi", tags=["wifi"])
 
+_SPACE_IN_ROOT_STMT = select((Location.root_id == bindparam("root_id")).label("same_root")).where(
+    Location.id == bindparam("space_id")
+)
+# Every create_wifi reference in one round-trip; each column is NULL when its row is missing.
+_CREATE_TARGETS_STMT = select(
+    select(Location.id == Location.root_id).where(Location.id == bindparam("root_id")).scalar_subquery().label("is_root"),
+    select(Location.root_id == bindparam("root_id"))
+    .where(Location.id == bindparam("space_id"))
+    .scalar_subquery()
+    .label("space_in_root"),
+    select(Vlan.root_id == bindparam("root_id"))
+    .where(Vlan.id == bindparam("vlan_id"))
+    .scalar_subquery()
+    .label("vlan_in_root"),
+)
+# Reveal needs only the access check and the ciphertext, not a hydrated WifiNetwork.
+_REVEAL_STMT = select(WifiNetwork.root_id, WifiNetwork.password_encrypted).where(
+    WifiNetwork.id == bindparam("wifi_id")
+)
+
 
 class WifiNetworkResponse(BaseModel):
     id: UUID
@@ -29,6 +50,9 @@ class WifiNetworkResponse(BaseModel):
     created_at: datetime
 
 
+_WIFI_LIST_ADAPTER = TypeAdapter(list[WifiNetworkResponse])
+
+
 class CreateWifiRequest(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
@@ -57,10 +81,11 @@ class RevealWifiResponse(BaseModel):
 
 
 def _validate_space(db: Session, root_id: UUID, space_id: UUID) -> None:
-    space = db.get(Location, space_id)
-    if space is None:
+    # One row answers both checks: no row means missing, False means another root.
+    same_root = db.scalar(_SPACE_IN_ROOT_STMT, {"space_id": space_id, "root_id": root_id})
+    if same_root is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
-    if space.root_id != root_id:
+    if not same_root:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Space must belong to the same root")
 
 
@@ -72,34 +97,45 @@ def _validate_vlan(db: Session, root_id: UUID, vlan_id: UUID) -> None:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="VLAN must belong to the same root")
 
 
+def _validate_create_targets(db: Session, root_id: UUID, space_id: UUID, vlan_id: UUID) -> None:
+    targets = db.execute(_CREATE_TARGETS_STMT, {"root_id": root_id, "space_id": space_id, "vlan_id": vlan_id}).one()
+    if not targets.is_root:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Root not found")
+    if targets.space_in_root is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
+    if not targets.space_in_root:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Space must belong to the same root")
+    if targets.vlan_in_root is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="VLAN not found")
+    if not targets.vlan_in_root:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="VLAN must belong to the same root")
+
+
 @router.get("", response_model=list[WifiNetworkResponse])
 def list_wifi(
     root_id: UUID = Query(...),
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
-) -> list[WifiNetworkResponse]:
-    require_root_access(db, current_user, root_id)
-    ensure_root_exists(db, root_id)
-
-    networks = db.scalars(
-        select(WifiNetwork)
+) -> Response:
+    require_accessible_root(db, current_user, root_id)
+
+    # Only the response columns; the encrypted password never leaves the database here.
+    rows = db.execute(
+        select(
+            WifiNetwork.id,
+            WifiNetwork.root_id,
+            WifiNetwork.space_id,
+            WifiNetwork.ssid,
+            WifiNetwork.security,
+            WifiNetwork.vlan_id,
+            WifiNetwork.notes,
+            WifiNetwork.created_at,
+        )
         .where(WifiNetwork.root_id == root_id)
         .order_by(WifiNetwork.ssid.asc(), WifiNetwork.created_at.asc())
     ).all()
-
-    return [
-        WifiNetworkResponse(
-            id=network.id,
-            root_id=network.root_id,
-            space_id=network.space_id,
-            ssid=network.ssid,
-            security=network.security,
-            vlan_id=network.vlan_id,
-            notes=network.notes,
-            created_at=network.created_at,
-        )
-        for network in networks
-    ]
+    items = [WifiNetworkResponse.model_construct(**row._mapping) for row in rows]
+    return Response(content=_WIFI_LIST_ADAPTER.dump_json(items), media_type="application/json")
 
 
 @router.post("", response_model=WifiNetworkResponse, status_code=status.HTTP_201_CREATED)
@@ -108,9 +144,7 @@ def create_wifi(
     _: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ) -> WifiNetworkResponse:
-    ensure_root_exists(db, payload.root_id)
-    _validate_space(db, payload.root_id, payload.space_id)
-    _validate_vlan(db, payload.root_id, payload.vlan_id)
+    _validate_create_targets(db, payload.root_id, payload.space_id, payload.vlan_id)
 
     network = WifiNetwork(
         root_id=payload.root_id,
@@ -123,7 +157,6 @@ def create_wifi(
     )
     db.add(network)
     db.commit()
-    db.refresh(network)
 
     return WifiNetworkResponse(
         id=network.id,
@@ -169,7 +202,6 @@ def update_wifi(
 
     db.add(network)
     db.commit()
-    db.refresh(network)
 
     return WifiNetworkResponse(
         id=network.id,
@@ -203,12 +235,13 @@ def reveal_wifi_password(
     wifi_id: UUID,
     current_user: User = Depends(require_user),
     db: Session = Depends(get_db),
-) -> RevealWifiResponse:
-    network = db.get(WifiNetwork, wifi_id)
+) -> ORJSONResponse:
+    network = db.execute(_REVEAL_STMT, {"wifi_id": wifi_id}).first()
     if network is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wi-Fi network not found")
 
     if current_user.role != UserRole.ADMIN:
         require_root_access(db, current_user, network.root_id)
 
-    return RevealWifiResponse(password=decrypt_secret(network.password_encrypted))
+    # Returned as a ready response so FastAPI skips validating and re-encoding it.
+    return ORJSONResponse(content={"password": decrypt_secret(network.password_encrypted)})
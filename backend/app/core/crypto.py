@@ -1,26 +1,42 @@
 import base64
 import hashlib
+import os
 
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from app.core.settings import get_settings
 
+settings = get_settings()
 
-def _build_fernet() -> Fernet:
-    settings = get_settings()
-    digest = hashlib.sha256(settings.APP_ENCRYPTION_KEY.encode("utf-8")).digest()
-    key = base64.urlsafe_b64encode(digest)
-    return Fernet(key)
+# Ciphertext is stored as raw bytes. New values are AES-256-GCM: a version byte,
+# the nonce, then ciphertext and tag. Values written before that are the ASCII
+# bytes of a Fernet token (always "gAAAAA..."), which still decrypt.
+_AESGCM_VERSION = b"\x02"
+_NONCE_SIZE = 12
 
+# Both ciphers are built once at import; the instances are safe to share across
+# threads. The GCM key is a separately labelled digest so it never equals Fernet's.
+_ENCRYPTION_KEY = settings.APP_ENCRYPTION_KEY.encode("utf-8")
+_FERNET = Fernet(base64.urlsafe_b64encode(hashlib.sha256(_ENCRYPTION_KEY).digest()))
+_AESGCM = AESGCM(hashlib.sha256(b"hardware-registry:aes-256-gcm:" + _ENCRYPTION_KEY).digest())
 
-def encrypt_secret(value: str) -> str:
-    fernet = _build_fernet()
-    return fernet.encrypt(value.encode("utf-8")).decode("utf-8")
 
+def encrypt_secret(value: str) -> bytes:
+    nonce = os.urandom(_NONCE_SIZE)
+    return _AESGCM_VERSION + nonce + _AESGCM.encrypt(nonce, value.encode("utf-8"), None)
 
-def decrypt_secret(token: str) -> str:
-    fernet = _build_fernet()
+
+def decrypt_secret(token: bytes) -> str:
+    if not token.startswith(_AESGCM_VERSION):
+        try:
+            return _FERNET.decrypt(token).decode("utf-8")
+        except InvalidToken as exc:
+            raise ValueError("Failed to decrypt secret") from exc
+
+    nonce_end = len(_AESGCM_VERSION) + _NONCE_SIZE
     try:
-        return fernet.decrypt(token.encode("utf-8")).decode("utf-8")
-    except InvalidToken as exc:
+        return _AESGCM.decrypt(token[len(_AESGCM_VERSION) : nonce_end], token[nonce_end:], None).decode("utf-8")
+    except (InvalidTag, ValueError) as exc:
         raise ValueError("Failed to decrypt secret") from exc
@@ -1,5 +1,13 @@
-from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import lru_cache
+import hashlib
+import hmac
+import threading
+import time
+from types import MappingProxyType
 from typing import Any
+from uuid import UUID
 
 import jwt
 from fastapi import HTTPException, status
@@ -10,35 +18,80 @@ from app.models.user import User
 settings = get_settings()
 ALGORITHM = "HS256"
 
+# The HMAC key, decode arguments and PyJWT instance are built once instead of on every call.
+_SECRET_KEY = settings.JWT_SECRET.encode("utf-8")
+_ALGORITHMS = [ALGORITHM]
+_JWT = jwt.PyJWT(options={"require": ["exp", "sub", "type"]})
+_ACCESS_TOKEN_LIFETIME_SECONDS = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TOKEN_LIFETIME_SECONDS = settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
 
-def _create_token(user: User, token_type: str, expires_delta: timedelta) -> str:
-    now = datetime.now(timezone.utc)
+# Verified tokens are memoized by digest so hot tokens skip signature checks.
+# Entries never outlive the token's own exp claim. Payloads are shared between
+# callers, so they are stored as read-only mappings.
+TOKEN_CACHE_MAX_ENTRIES = 4096
+TOKEN_CACHE_TTL_SECONDS = 60
+
+_token_cache: OrderedDict[bytes, tuple[float, Mapping[str, Any]]] = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _create_token(user: User, token_type: str, lifetime_seconds: int) -> str:
+    now = int(time.time())
     payload: dict[str, Any] = {
         "sub": str(user.id),
         "email": user.email,
         "role": user.role.value,
         "type": token_type,
-        "iat": int(now.timestamp()),
-        "exp": int((now + expires_delta).timestamp()),
+        "iat": now,
+        "exp": now + lifetime_seconds,
     }
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=ALGORITHM)
+    return _JWT.encode(payload, _SECRET_KEY, algorithm=ALGORITHM)
 
 
 def create_access_token(user: User) -> str:
-    return _create_token(user, "access", timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES))
+    return _create_token(user, "access", _ACCESS_TOKEN_LIFETIME_SECONDS)
 
 
 def create_refresh_token(user: User) -> str:
-    return _create_token(user, "refresh", timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS))
+    return _create_token(user, "refresh", _REFRESH_TOKEN_LIFETIME_SECONDS)
+
+
+def _verify_cached(token: str) -> Mapping[str, Any]:
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > now:
+                _token_cache.move_to_end(key)
+                return payload
+            del _token_cache[key]
+
+    payload = MappingProxyType(_JWT.decode(token, _SECRET_KEY, algorithms=_ALGORITHMS))
+    expires_at = min(float(payload.get("exp", now)), now + TOKEN_CACHE_TTL_SECONDS)
+    with _token_cache_lock:
+        _token_cache[key] = (expires_at, payload)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.popitem(last=False)
+    return payload
+
+
+@lru_cache(maxsize=TOKEN_CACHE_MAX_ENTRIES)
+def parse_subject(subject: str) -> UUID:
+    # UUIDs are immutable, so the parsed "sub" of hot tokens can be shared.
+    return UUID(subject)
 
 
-def decode_token(token: str, expected_type: str) -> dict[str, Any]:
+def decode_token(token: str, expected_type: str) -> Mapping[str, Any]:
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[ALGORITHM])
+        payload = _verify_cached(token)
     except jwt.InvalidTokenError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
-    if payload.get("type") != expected_type:
+    token_type = str(payload.get("type", ""))
+    if not hmac.compare_digest(token_type.encode("utf-8"), expected_type.encode("utf-8")):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
 
     return payload
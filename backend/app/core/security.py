@@ -1,7 +1,12 @@
+from collections import OrderedDict
+import hashlib
+import hmac
 import random
 import re
 import secrets
 import string
+import threading
+import time
 
 import bcrypt
 
@@ -10,20 +15,34 @@ PASSWORD_POLICY_MESSAGE = (
 )
 
 _SPECIAL = "!@#$%^&*()-_=+[]{}<>?"
+_ALPHABET = string.ascii_letters + string.digits + _SPECIAL
+_SYSTEM_RANDOM = random.SystemRandom()
+
+# Successful bcrypt checks are remembered for about a minute, long enough for a
+# login followed by a password change in the same session. Keys are an HMAC,
+# under a per-process random key, of the stored hash and the password, so no
+# plaintext is kept and a password change (new hash) can never hit an old entry.
+# Failures are never cached, so every wrong guess still pays the full bcrypt cost.
+VERIFY_CACHE_MAX_ENTRIES = 1024
+VERIFY_CACHE_TTL_SECONDS = 60
+
+_verify_cache_key = secrets.token_bytes(32)
+_verified: OrderedDict[bytes, float] = OrderedDict()
+_verified_lock = threading.Lock()
+
+# Compiled once; each search still runs as a C-level scan over the password.
+_PASSWORD_RULES = (
+    re.compile(r"[A-Z]"),
+    re.compile(r"[a-z]"),
+    re.compile(r"[0-9]"),
+    re.compile(r"[^A-Za-z0-9]"),
+)
 
 
 def validate_password_policy(password: str) -> bool:
     if len(password) < 12:
         return False
-    if not re.search(r"[A-Z]", password):
-        return False
-    if not re.search(r"[a-z]", password):
-        return False
-    if not re.search(r"[0-9]", password):
-        return False
-    if not re.search(r"[^A-Za-z0-9]", password):
-        return False
-    return True
+    return all(rule.search(password) for rule in _PASSWORD_RULES)
 
 
 def hash_password(password: str) -> str:
@@ -31,22 +50,38 @@ def hash_password(password: str) -> str:
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+    password_bytes = password.encode("utf-8")
+    hash_bytes = password_hash.encode("utf-8")
+    key = hmac.new(_verify_cache_key, hash_bytes + b"\x00" + password_bytes, hashlib.sha256).digest()
+    now = time.monotonic()
+    with _verified_lock:
+        expires_at = _verified.get(key)
+        if expires_at is not None:
+            if expires_at > now:
+                _verified.move_to_end(key)
+                return True
+            del _verified[key]
+
+    if not bcrypt.checkpw(password_bytes, hash_bytes):
+        return False
+    with _verified_lock:
+        _verified[key] = now + VERIFY_CACHE_TTL_SECONDS
+        _verified.move_to_end(key)
+        while len(_verified) > VERIFY_CACHE_MAX_ENTRIES:
+            _verified.popitem(last=False)
+    return True
 
 
 def generate_temporary_password(length: int = 16) -> str:
     final_length = max(length, 12)
-    alphabet = string.ascii_letters + string.digits + _SPECIAL
-
-    while True:
-        chars = [
-            secrets.choice(string.ascii_uppercase),
-            secrets.choice(string.ascii_lowercase),
-            secrets.choice(string.digits),
-            secrets.choice(_SPECIAL),
-        ]
-        chars.extend(secrets.choice(alphabet) for _ in range(final_length - 4))
-        random.SystemRandom().shuffle(chars)
-        candidate = "".join(chars)
-        if validate_password_policy(candidate):
-            return candidate
+    # One pick from each required class plus a length of at least 12 always
+    # satisfies the policy, so no validate-and-retry loop is needed.
+    chars = [
+        secrets.choice(string.ascii_uppercase),
+        secrets.choice(string.ascii_lowercase),
+        secrets.choice(string.digits),
+        secrets.choice(_SPECIAL),
+    ]
+    chars.extend(secrets.choice(_ALPHABET) for _ in range(final_length - 4))
+    _SYSTEM_RANDOM.shuffle(chars)
+    return "".join(chars)
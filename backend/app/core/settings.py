@@ -7,7 +7,14 @@ class Settings(BaseSettings):
     APP_NAME: str = "Hardware Registry API"
     APP_ENV: str = "dev"
     API_LOG_LEVEL: str = "INFO"
+    API_THREADPOOL_SIZE: int = 40
+    API_DOCS_ENABLED: bool = True
     DATABASE_URL: str = "postgresql+psycopg://hardware_registry:change-me-db-password@db:5432/hardware_registry"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_QUERY_CACHE_SIZE: int = 1200
     JWT_SECRET: str = "change-me-jwt-secret"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 14
@@ -0,0 +1,33 @@
+import enum
+from typing import Any
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+
+class SmallIntEnum(TypeDecorator):
+    """Stores an enum as a smallint code: the member's position in ``members``.
+
+    The order of ``members`` is the on-disk encoding, so new members must only be
+    appended.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[enum.Enum], members: tuple[enum.Enum, ...]) -> None:
+        super().__init__()
+        self.enum_class = enum_class
+        self.members = members
+        self._codes = {member: code for code, member in enumerate(members)}
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> int | None:
+        if value is None:
+            return None
+        return self._codes[self.enum_class(value)]
+
+    def process_result_value(self, value: int | None, dialect: Dialect) -> enum.Enum | None:
+        if value is None:
+            return None
+        return self.members[value]
@@ -1,14 +1,30 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from app.api.routes import router as api_router
 from app.core.settings import get_settings
 
 settings = get_settings()
 
-app = FastAPI(title=settings.APP_NAME)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Sync endpoints run on AnyIO's worker threads; bcrypt releases the GIL, so
+    # slow password checks only hold a thread, and this sets how many may run at once.
+    to_thread.current_default_thread_limiter().total_tokens = settings.API_THREADPOOL_SIZE
+    yield
+
+
+# FastAPI builds the OpenAPI schema once and caches it; deployments that never
+# browse the docs can skip that and the docs routes entirely.
+docs_kwargs = {} if settings.API_DOCS_ENABLED else {"openapi_url": None, "docs_url": None, "redoc_url": None}
+app = FastAPI(title=settings.APP_NAME, default_response_class=ORJSONResponse, lifespan=lifespan, **docs_kwargs)
 
 if settings.APP_ENV.lower() == "dev":
     app.add_middleware(
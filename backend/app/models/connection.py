@@ -1,11 +1,12 @@
 import enum
 import uuid
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Text, func
+from sqlalchemy import Enum, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, TimestampedMixin
+from app.db.uuid7 import uuid7
 
 
 class ConnectionTechnology(str, enum.Enum):
@@ -20,25 +21,28 @@ class ConnectionTechnology(str, enum.Enum):
     OTHER = "OTHER"
 
 
-class Connection(Base):
+class Connection(TimestampedMixin, Base):
     __tablename__ = "connections"
+    __table_args__ = (Index("ix_connections_root_id_created_at", "root_id", "created_at"),)
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     root_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("locations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     from_interface_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("interfaces.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     to_interface_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("interfaces.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     receiver_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
@@ -54,6 +58,6 @@ class Connection(Base):
         UUID(as_uuid=True),
         ForeignKey("vlans.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,21 +1,26 @@
 import uuid
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import Boolean, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, TimestampedMixin
+from app.db.uuid7 import uuid7
 
 
-class Device(Base):
+class Device(TimestampedMixin, Base):
     __tablename__ = "devices"
+    __table_args__ = (
+        Index("ix_devices_root_id_name_created_at", "root_id", "name", "created_at", "id"),
+        Index("ix_devices_root_id_space_id_name_created_at", "root_id", "space_id", "name", "created_at", "id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     root_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("locations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     space_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -36,4 +41,3 @@ class Device(Base):
     supports_matter_thread: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
     supports_bluetooth: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
     supports_ble: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default="false")
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,11 +1,13 @@
 import enum
 import uuid
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Text, func
+from sqlalchemy import ForeignKey, Index, LargeBinary, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, TimestampedMixin
+from app.db.types import SmallIntEnum
+from app.db.uuid7 import uuid7
 
 
 class SecretType(str, enum.Enum):
@@ -15,23 +17,28 @@ class SecretType(str, enum.Enum):
     OTHER = "OTHER"
 
 
-class Secret(Base):
+# Stored as smallint codes in this order; append only.
+SECRET_TYPE_CODES = (SecretType.PASSWORD, SecretType.TOKEN, SecretType.API_KEY, SecretType.OTHER)
+
+
+class Secret(TimestampedMixin, Base):
     __tablename__ = "secrets"
+    __table_args__ = (Index("ix_secrets_root_id_created_at", "root_id", "created_at"),)
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     root_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("locations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
-    type: Mapped[SecretType] = mapped_column(Enum(SecretType, name="secret_type"), nullable=False)
+    type: Mapped[SecretType] = mapped_column(SmallIntEnum(SecretType, SECRET_TYPE_CODES), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    encrypted_value: Mapped[str] = mapped_column(Text, nullable=False)
+    encrypted_value: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     linked_device_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("devices.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
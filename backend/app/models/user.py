@@ -1,11 +1,13 @@
 import enum
 import uuid
 
-from sqlalchemy import Boolean, DateTime, Enum, String, func
+from sqlalchemy import Boolean, Index, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
-from app.db.base import Base
+from app.db.base import Base, TimestampedMixin
+from app.db.types import SmallIntEnum
+from app.db.uuid7 import uuid7
 
 
 class UserRole(str, enum.Enum):
@@ -13,13 +15,22 @@ class UserRole(str, enum.Enum):
     ADMIN = "ADMIN"
 
 
-class User(Base):
+# Stored as smallint codes in this order; append only.
+USER_ROLE_CODES = (UserRole.USER, UserRole.ADMIN)
+
+
+class User(TimestampedMixin, Base):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
-    role: Mapped[UserRole] = mapped_column(Enum(UserRole, name="user_role"), nullable=False, default=UserRole.USER)
+    role: Mapped[UserRole] = mapped_column(
+        SmallIntEnum(UserRole, USER_ROLE_CODES),
+        nullable=False,
+        default=UserRole.USER,
+    )
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True, server_default="true")
     must_change_password: Mapped[bool] = mapped_column(
         Boolean,
@@ -27,4 +38,14 @@ class User(Base):
         default=False,
         server_default="false",
     )
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_users_email", func.lower(email), unique=True),
+        # Role code 1 is ADMIN (see USER_ROLE_CODES); keeps the setup check to a handful of rows.
+        Index("ix_users_admin", "id", postgresql_where=text("role = 1")),
+    )
+
+    @validates("email")
+    def _normalize_email(self, _key: str, value: str) -> str:
+        # Stored emails are always lowercase, matching the lower(email) unique index.
+        return value.strip().lower()
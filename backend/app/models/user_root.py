@@ -19,4 +19,5 @@ class UserRoot(Base):
         UUID(as_uuid=True),
         ForeignKey("locations.id", ondelete="CASCADE"),
         primary_key=True,
+        index=True,
     )
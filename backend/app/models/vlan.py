@@ -1,17 +1,19 @@
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import CIDR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, TimestampedMixin
+from app.db.uuid7 import uuid7
 
 
-class Vlan(Base):
+class Vlan(TimestampedMixin, Base):
     __tablename__ = "vlans"
     __table_args__ = (UniqueConstraint("root_id", "vlan_id", name="uq_vlans_root_vlan"),)
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     root_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("locations.id", ondelete="CASCADE"),
@@ -20,6 +22,6 @@ class Vlan(Base):
     )
     vlan_id: Mapped[int] = mapped_column(Integer, nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    cidr: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Native cidr; the psycopg dialect returns it as text, matching VlanResponse.cidr.
+    cidr: Mapped[str] = mapped_column(CIDR, nullable=False)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
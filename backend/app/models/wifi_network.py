@@ -1,21 +1,23 @@
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import ForeignKey, Index, LargeBinary, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, TimestampedMixin
+from app.db.uuid7 import uuid7
 
 
-class WifiNetwork(Base):
+class WifiNetwork(TimestampedMixin, Base):
     __tablename__ = "wifi_networks"
+    __table_args__ = (Index("ix_wifi_networks_root_id_ssid_created_at", "root_id", "ssid", "created_at"),)
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     root_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("locations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     space_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -24,12 +26,12 @@ class WifiNetwork(Base):
         index=True,
     )
     ssid: Mapped[str] = mapped_column(String(255), nullable=False)
-    password_encrypted: Mapped[str] = mapped_column(Text, nullable=False)
+    password_encrypted: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     security: Mapped[str] = mapped_column(String(100), nullable=False)
     vlan_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("vlans.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
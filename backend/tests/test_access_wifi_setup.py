@@ -1,18 +1,33 @@
+import json
 import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
+from fastapi.testclient import TestClient
 from pydantic import ValidationError
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects import postgresql
 
 from app.api import connections as connections_module
+from app.api import deps as deps_module
 from app.api import devices as devices_module
+from app.api import graph as graph_module
 from app.api import locations as locations_module
+from app.api import pagination as pagination_module
 from app.api import root_access as root_access_module
 from app.api import setup as setup_api
+from app.api import topology as topology_module
 from app.api import vlans as vlans_module
 from app.api import wifi as wifi_module
-from app.core.crypto import encrypt_secret
+from app.core import crypto as crypto_module
+from app.core.crypto import decrypt_secret, encrypt_secret
+from app.db.base import Base
+from app.db.session import get_db
+from app.db.uuid7 import uuid7
+from app.main import app
 from app.models.connection import ConnectionTechnology
 from app.models.user import UserRole
 
@@ -21,7 +36,7 @@ def test_require_root_access_allows_assigned_root(monkeypatch):
     root_id = uuid.uuid4()
     user = SimpleNamespace(id=uuid.uuid4(), role=UserRole.USER)
 
-    monkeypatch.setattr(root_access_module, "get_accessible_root_ids", lambda _db, _user: {root_id})
+    monkeypatch.setattr(root_access_module, "user_has_root_access", lambda _db, _user, _root_id: True)
 
     root_access_module.require_root_access(object(), user, root_id)
 
@@ -29,7 +44,7 @@ def test_require_root_access_allows_assigned_root(monkeypatch):
 def test_require_root_access_blocks_unassigned_root(monkeypatch):
     user = SimpleNamespace(id=uuid.uuid4(), role=UserRole.USER)
 
-    monkeypatch.setattr(root_access_module, "get_accessible_root_ids", lambda _db, _user: set())
+    monkeypatch.setattr(root_access_module, "user_has_root_access", lambda _db, _user, _root_id: False)
 
     with pytest.raises(HTTPException) as exc:
         root_access_module.require_root_access(object(), user, uuid.uuid4())
@@ -37,6 +52,51 @@ def test_require_root_access_blocks_unassigned_root(monkeypatch):
     assert exc.value.status_code == 403
 
 
+RootAccessRow = namedtuple("RootAccessRow", ["Location", "has_access"])
+
+
+class FakeRootAccessDb:
+    def __init__(self, row):
+        self._row = row
+
+    def execute(self, *_args, **_kwargs):
+        return SimpleNamespace(first=lambda: self._row)
+
+
+def test_require_accessible_root_returns_root():
+    root = SimpleNamespace(id=uuid.uuid4())
+    root.root_id = root.id
+    user = SimpleNamespace(id=uuid.uuid4(), role=UserRole.USER)
+
+    db = FakeRootAccessDb(RootAccessRow(root, True))
+
+    assert root_access_module.require_accessible_root(db, user, root.id) is root
+
+
+def test_require_accessible_root_rejects_unassigned_user():
+    user = SimpleNamespace(id=uuid.uuid4(), role=UserRole.USER)
+
+    for row in (None, RootAccessRow(SimpleNamespace(id=uuid.uuid4(), root_id=None), False)):
+        with pytest.raises(HTTPException) as exc:
+            root_access_module.require_accessible_root(FakeRootAccessDb(row), user, uuid.uuid4())
+
+        assert exc.value.status_code == 403
+
+
+def test_require_accessible_root_loads_root_once_for_admin(monkeypatch):
+    root = SimpleNamespace(id=uuid.uuid4())
+    root.root_id = root.id
+    admin = SimpleNamespace(id=uuid.uuid4(), role=UserRole.ADMIN)
+
+    monkeypatch.setattr(root_access_module, "user_has_root_access", lambda *_args: (_ for _ in ()).throw(Exception()))
+
+    assert root_access_module.require_accessible_root(SimpleNamespace(get=lambda _model, _id: root), admin, root.id) is root
+    with pytest.raises(HTTPException) as exc:
+        root_access_module.require_accessible_root(SimpleNamespace(get=lambda _model, _id: None), admin, root.id)
+
+    assert exc.value.status_code == 403
+
+
 class FakeDb:
     def __init__(self, network=None, scalar_result=None):
         self._network = network
@@ -45,10 +105,71 @@ class FakeDb:
     def get(self, _model, _id):
         return self._network
 
+    def execute(self, *_args, **_kwargs):
+        return SimpleNamespace(first=lambda: self._network)
+
     def scalar(self, *_args, **_kwargs):
         return self._scalar_result
 
 
+def test_user_has_root_access_probes_single_assignment():
+    user = SimpleNamespace(id=uuid.uuid4(), role=UserRole.USER)
+    root_id = uuid.uuid4()
+
+    assert root_access_module.user_has_root_access(FakeDb(scalar_result=root_id), user, root_id) is True
+    assert root_access_module.user_has_root_access(FakeDb(scalar_result=None), user, root_id) is False
+
+
+@pytest.mark.parametrize(
+    "stmt",
+    [
+        root_access_module._USER_ROOTS_STMT,
+        root_access_module._USER_ROOT_ACCESS_STMT,
+        root_access_module._USER_ROOT_WITH_ACCESS_STMT,
+    ],
+)
+def test_user_root_lookups_bind_native_uuid(stmt):
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    sql = str(compiled).upper()
+
+    # Parameters may carry a ::UUID bind cast, but nothing is compared as text.
+    assert "::TEXT" not in sql
+    assert "::VARCHAR" not in sql
+    assert "CAST(" not in sql
+    for name in ("user_id", "root_id"):
+        if name in compiled.binds:
+            assert isinstance(compiled.binds[name].type, postgresql.UUID), name
+
+
+def test_ensure_root_id_exists_caches_confirmed_roots():
+    root = SimpleNamespace(id=uuid.uuid4())
+    root.root_id = root.id
+    lookups = []
+
+    def get(_model, root_id):
+        lookups.append(root_id)
+        return root
+
+    db = SimpleNamespace(get=get)
+    root_access_module.ensure_root_id_exists(db, root.id)
+    root_access_module.ensure_root_id_exists(db, root.id)
+    root_access_module.forget_root(root.id)
+    root_access_module.ensure_root_id_exists(db, root.id)
+
+    assert lookups == [root.id, root.id]
+
+
+def test_ensure_root_id_exists_does_not_cache_missing_roots():
+    db = SimpleNamespace(get=lambda _model, _id: None)
+    root_id = uuid.uuid4()
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            root_access_module.ensure_root_id_exists(db, root_id)
+
+        assert exc.value.status_code == 404
+
+
 def test_wifi_reveal_allows_admin_without_root_check(monkeypatch):
     network = SimpleNamespace(
         id=uuid.uuid4(),
@@ -62,7 +183,7 @@ def test_wifi_reveal_allows_admin_without_root_check(monkeypatch):
 
     response = wifi_module.reveal_wifi_password(network.id, SimpleNamespace(role=UserRole.ADMIN), db)
 
-    assert response.password == "Secret!2026"
+    assert json.loads(response.body) == {"password": "Secret!2026"}
 
 
 def test_wifi_reveal_blocks_user_without_root_access(monkeypatch):
@@ -114,6 +235,34 @@ def test_create_first_admin_rejects_weak_password(monkeypatch):
     assert exc.value.status_code == 422
 
 
+def test_secret_encryption_round_trips_with_aes_gcm():
+    token = encrypt_secret("Secret!2026")
+
+    assert token.startswith(b"\x02")
+    assert token != encrypt_secret("Secret!2026")
+    assert decrypt_secret(token) == "Secret!2026"
+
+
+def test_secret_decryption_accepts_legacy_fernet_tokens():
+    legacy = crypto_module._FERNET.encrypt(b"Secret!2026")
+
+    assert decrypt_secret(legacy) == "Secret!2026"
+
+
+@pytest.mark.parametrize("token", [b"", b"\x02", b"\x02short", b"gAAAAAtampered"])
+def test_secret_decryption_rejects_invalid_tokens(token):
+    with pytest.raises(ValueError):
+        decrypt_secret(token)
+
+
+def test_secret_decryption_rejects_tampered_ciphertext():
+    token = encrypt_secret("Secret!2026")
+    tampered = token[:-1] + bytes([token[-1] ^ 1])
+
+    with pytest.raises(ValueError):
+        decrypt_secret(tampered)
+
+
 def test_wifi_create_request_requires_vlan():
     with pytest.raises(ValidationError):
         wifi_module.CreateWifiRequest(
@@ -125,6 +274,66 @@ def test_wifi_create_request_requires_vlan():
         )
 
 
+CreateTargets = namedtuple("CreateTargets", ["is_root", "space_in_root", "vlan_in_root"])
+
+
+@pytest.mark.parametrize(
+    ("targets", "expected_status", "expected_detail"),
+    [
+        (CreateTargets(None, True, True), 404, "Root not found"),
+        (CreateTargets(False, True, True), 404, "Root not found"),
+        (CreateTargets(True, None, True), 404, "Space not found"),
+        (CreateTargets(True, False, True), 422, "Space must belong to the same root"),
+        (CreateTargets(True, True, None), 404, "VLAN not found"),
+        (CreateTargets(True, True, False), 422, "VLAN must belong to the same root"),
+    ],
+)
+def test_wifi_create_targets_are_validated_from_one_row(targets, expected_status, expected_detail):
+    db = SimpleNamespace(execute=lambda *_args: SimpleNamespace(one=lambda: targets))
+
+    with pytest.raises(HTTPException) as exc:
+        wifi_module._validate_create_targets(db, uuid.uuid4(), uuid.uuid4(), uuid.uuid4())
+
+    assert exc.value.status_code == expected_status
+    assert exc.value.detail == expected_detail
+
+
+def test_list_wifi_reads_plain_columns_in_one_query(monkeypatch):
+    statements = []
+
+    def execute(stmt, *_args):
+        statements.append(stmt)
+        return SimpleNamespace(all=lambda: [])
+
+    monkeypatch.setattr(wifi_module, "require_accessible_root", lambda *_args: None)
+
+    response = wifi_module.list_wifi(uuid.uuid4(), SimpleNamespace(role=UserRole.USER), SimpleNamespace(execute=execute))
+
+    assert response.body == b"[]"
+    assert len(statements) == 1
+    # Column rows carry no ORM state, so serializing them cannot trigger per-row loads.
+    descriptions = statements[0].column_descriptions
+    assert all(description["type"] is not wifi_module.WifiNetwork for description in descriptions)
+    assert "password_encrypted" not in {description["name"] for description in descriptions}
+
+
+def test_models_declare_no_relationships():
+    # Reads select columns and join explicitly, so nothing can fall into per-row lazy loads.
+    for mapper in Base.registry.mappers:
+        assert not mapper.relationships, f"{mapper.class_.__name__}: {list(mapper.relationships.keys())}"
+
+
+def test_foreign_keys_lead_an_index():
+    # Without one, ON DELETE CASCADE / SET NULL on the parent scans the whole table.
+    for table in Base.metadata.tables.values():
+        leading = [table.primary_key.columns.values()[0]]
+        leading += [index.expressions[0] for index in table.indexes]
+        leading += [next(iter(c.columns)) for c in table.constraints if isinstance(c, UniqueConstraint)]
+        leading_names = {getattr(column, "name", None) for column in leading}
+        for foreign_key in table.foreign_keys:
+            assert foreign_key.parent.name in leading_names, f"{table.name}.{foreign_key.parent.name}"
+
+
 def test_vlan_cidr_validation_rejects_invalid_value():
     with pytest.raises(HTTPException) as exc:
         vlans_module._normalize_cidr("10.10.10.1/24")
@@ -160,6 +369,9 @@ class FakeDeleteDb:
             return 0
         return self._scalar_results.pop(0)
 
+    def execute(self, *_args, **_kwargs):
+        return SimpleNamespace(one=lambda: tuple(self._scalar_results))
+
     def delete(self, entity):
         self.deleted.append(entity)
 
@@ -276,3 +488,293 @@ def test_delete_root_succeeds_without_dependencies(monkeypatch):
     assert response["status"] == "ok"
     assert db.deleted == [root]
     assert db.committed is True
+
+
+class FakeRowsDb:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, *_args, **_kwargs):
+        return SimpleNamespace(all=lambda: self._rows)
+
+
+def test_connection_endpoints_are_resolved_in_request_order():
+    from_interface = SimpleNamespace(id=uuid.uuid4())
+    to_interface = SimpleNamespace(id=uuid.uuid4())
+    from_device = SimpleNamespace(id=uuid.uuid4())
+    to_device = SimpleNamespace(id=uuid.uuid4())
+    db = FakeRowsDb([(to_interface, to_device), (from_interface, from_device)])
+
+    endpoints = connections_module._get_endpoints_with_devices(db, from_interface.id, to_interface.id)
+
+    assert endpoints == ((from_interface, from_device), (to_interface, to_device))
+
+
+def test_connection_endpoints_require_both_interfaces():
+    from_interface = SimpleNamespace(id=uuid.uuid4())
+    db = FakeRowsDb([(from_interface, SimpleNamespace(id=uuid.uuid4()))])
+
+    with pytest.raises(HTTPException) as exc:
+        connections_module._get_endpoints_with_devices(db, from_interface.id, uuid.uuid4())
+
+    assert exc.value.status_code == 404
+
+
+def test_device_receiver_capabilities_are_collected_from_payload():
+    payload = devices_module.CreateDeviceRequest(
+        root_id=uuid.uuid4(),
+        space_id=uuid.uuid4(),
+        name="Hub",
+        type="hub",
+        is_receiver=True,
+        supports_zigbee=True,
+    )
+
+    is_receiver, capabilities = devices_module._normalize_receiver_payload(
+        payload.is_receiver,
+        devices_module._collect_receiver_capabilities(payload),
+    )
+
+    assert is_receiver is True
+    assert set(capabilities) == set(devices_module.RECEIVER_CAPABILITY_FIELDS)
+    assert [field for field, enabled in capabilities.items() if enabled] == ["supports_zigbee"]
+
+
+def test_device_non_receiver_normalizes_to_no_capabilities():
+    is_receiver, capabilities = devices_module._normalize_receiver_payload(False, 0)
+
+    assert is_receiver is False
+    assert not any(capabilities.values())
+
+
+def test_device_non_receiver_rejects_capabilities():
+    with pytest.raises(HTTPException) as exc:
+        devices_module._normalize_receiver_payload(False, 0b100)
+
+    assert exc.value.status_code == 422
+
+
+class FakePatchDb:
+    def __init__(self, device):
+        self._device = device
+
+    def get(self, _model, _id):
+        return self._device
+
+    def add(self, _obj):
+        pass
+
+    def commit(self):
+        pass
+
+
+def test_get_device_parses_aggregated_interfaces(monkeypatch):
+    device_id = uuid.uuid4()
+    interface_id = uuid.uuid4()
+    fields = {field: None for field in devices_module.DeviceSummaryResponse.model_fields}
+    fields.update(id=device_id, root_id=uuid.uuid4())
+    interface_json = {
+        "id": str(interface_id),
+        "device_id": str(device_id),
+        "name": "eth0",
+        "type": "ethernet",
+        "mac": "aa:bb:cc:dd:ee:ff",
+        "notes": None,
+        "created_at": "2026-02-10T12:00:00+00:00",
+    }
+    rows = {
+        "with": SimpleNamespace(root_id=fields["root_id"], _mapping={**fields, "interfaces": [interface_json]}),
+        "without": SimpleNamespace(root_id=fields["root_id"], _mapping={**fields, "interfaces": None}),
+    }
+    monkeypatch.setattr(devices_module, "require_root_access", lambda *_args: None)
+    request = SimpleNamespace(headers={})
+
+    for key, expected_ids in (("with", [interface_id]), ("without", [])):
+        db = SimpleNamespace(execute=lambda *_args, key=key: SimpleNamespace(first=lambda: rows[key]))
+        body = devices_module.get_device(device_id, request, Response(), SimpleNamespace(), db)
+
+        assert [interface.id for interface in body.interfaces] == expected_ids
+    assert body.id == device_id
+
+
+def test_aggregated_interface_ids_and_timestamps_round_trip():
+    # json_agg renders uuid and timestamptz as text; parsing must restore the exact values.
+    interface_id = uuid7()
+    created_at = datetime(2026, 2, 10, 12, 30, 45, 123456, tzinfo=timezone(timedelta(hours=1)))
+    interface_json = {
+        "id": str(interface_id),
+        "device_id": str(uuid7()),
+        "name": "eth0",
+        "type": "ethernet",
+        "mac": None,
+        "notes": None,
+        "created_at": "2026-02-10T12:30:45.123456+01:00",
+    }
+
+    (interface,) = devices_module._INTERFACE_LIST_ADAPTER.validate_python([interface_json])
+
+    assert interface.id == interface_id
+    assert isinstance(interface.id, uuid.UUID)
+    assert interface.created_at == created_at
+    assert interface.created_at.utcoffset() == created_at.utcoffset()
+
+
+def test_update_device_applies_only_sent_fields():
+    device = SimpleNamespace(
+        id=uuid.uuid4(),
+        root_id=uuid.uuid4(),
+        space_id=uuid.uuid4(),
+        name="Hub",
+        type="hub",
+        vendor="Acme",
+        model="H1",
+        serial=None,
+        notes=None,
+        is_receiver=True,
+        supports_wifi=True,
+        supports_ethernet=False,
+        supports_zigbee=False,
+        supports_matter_thread=False,
+        supports_bluetooth=False,
+        supports_ble=False,
+        created_at=None,
+    )
+    payload = devices_module.UpdateDeviceRequest(name=None, vendor=None, supports_zigbee=True)
+
+    devices_module.update_device(device.id, payload, SimpleNamespace(role=UserRole.ADMIN), FakePatchDb(device))
+
+    assert device.name == "Hub"
+    assert device.vendor is None
+    assert device.model == "H1"
+    assert device.supports_wifi is True
+    assert device.supports_zigbee is True
+
+
+@pytest.mark.parametrize(("same_root", "expected_status"), [(None, 404), (False, 422)])
+def test_validate_space_distinguishes_missing_and_foreign_space(same_root, expected_status):
+    db = SimpleNamespace(scalar=lambda *_args: same_root)
+
+    with pytest.raises(HTTPException) as exc:
+        devices_module._validate_space(db, uuid.uuid4(), uuid.uuid4())
+
+    assert exc.value.status_code == expected_status
+
+
+def test_apply_page_without_limit_keeps_full_list():
+    query = pagination_module.apply_page(devices_module._LIST_DEVICES_STMT, pagination_module.Page(limit=None, offset=0))
+
+    assert query._limit_clause is None
+    assert query._offset_clause is None
+
+
+def test_apply_page_sets_limit_and_offset():
+    query = pagination_module.apply_page(devices_module._LIST_DEVICES_STMT, pagination_module.Page(limit=50, offset=100))
+
+    assert query._limit == 50
+    assert query._offset == 100
+
+
+def test_creates_cycle_short_circuits_without_query():
+    location_id = uuid.uuid4()
+
+    assert locations_module._creates_cycle(object(), location_id, None) is False
+    assert locations_module._creates_cycle(object(), location_id, location_id) is True
+
+
+def test_creates_cycle_checks_ancestors_in_one_query():
+    assert locations_module._creates_cycle(FakeDb(scalar_result=True), uuid.uuid4(), uuid.uuid4()) is True
+    assert locations_module._creates_cycle(FakeDb(scalar_result=False), uuid.uuid4(), uuid.uuid4()) is False
+
+
+def test_build_tree_sorts_children_case_insensitively():
+    root_id = uuid.uuid4()
+
+    def location(name, parent_id, location_id=None):
+        return SimpleNamespace(
+            id=location_id or uuid.uuid4(),
+            name=name,
+            parent_id=parent_id,
+            root_id=root_id,
+            notes=None,
+            created_at=None,
+        )
+
+    root = location("Home", None, root_id)
+    garage = location("garage", root_id)
+    attic = location("Attic", root_id)
+    shelf_b = location("shelf B", garage.id)
+    shelf_a = location("Shelf a", garage.id)
+
+    tree = locations_module._build_tree([shelf_b, garage, root, shelf_a, attic], root_id, {garage.id: 2})
+
+    assert [child.name for child in tree.children] == ["Attic", "garage"]
+    assert [child.name for child in tree.children[1].children] == ["Shelf a", "shelf B"]
+    assert tree.children[1].device_count == 2
+
+
+def test_list_roots_sorts_accessible_roots_by_name(monkeypatch):
+    roots = [
+        SimpleNamespace(id=uuid.uuid4(), name=name, notes=None, created_at=None) for name in ("office", "Cabin", "home")
+    ]
+
+    monkeypatch.setattr(locations_module, "get_accessible_roots", lambda _db, _user: roots)
+
+    response = locations_module.list_roots(SimpleNamespace(role=UserRole.USER), object())
+
+    assert [root.name for root in response] == ["Cabin", "home", "office"]
+
+
+def test_graph_returns_not_modified_for_matching_etag(monkeypatch):
+    db = SimpleNamespace(
+        scalars=lambda *_args, **_kwargs: SimpleNamespace(all=lambda: []),
+        execute=lambda *_args, **_kwargs: SimpleNamespace(all=lambda: []),
+    )
+    monkeypatch.setattr(graph_module, "require_accessible_root", lambda *_args: None)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[deps_module.require_user] = lambda: SimpleNamespace(role=UserRole.ADMIN)
+    try:
+        client = TestClient(app)
+        first = client.get("/api/graph", params={"root_id": str(uuid.uuid4())})
+        second = client.get(
+            "/api/graph",
+            params={"root_id": str(uuid.uuid4())},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200
+    assert first.json() == {"devices": [], "connections": []}
+    assert second.status_code == 304
+
+
+def test_topology_png_skips_rendering_for_unchanged_topology(monkeypatch):
+    db = SimpleNamespace(execute=lambda *_args, **_kwargs: SimpleNamespace(all=lambda: []))
+    renders = []
+    real_render = topology_module._render_png
+
+    def counting_render(*args):
+        renders.append(args[0])
+        return real_render(*args)
+
+    monkeypatch.setattr(topology_module, "require_accessible_root", lambda *_args: None)
+    monkeypatch.setattr(topology_module, "_render_png", counting_render)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[deps_module.require_user] = lambda: SimpleNamespace(role=UserRole.ADMIN)
+    root_id = str(uuid.uuid4())
+    try:
+        client = TestClient(app)
+        first = client.get("/api/topology/png", params={"root_id": root_id})
+        second = client.get("/api/topology/png", params={"root_id": root_id})
+        third = client.get(
+            "/api/topology/png",
+            params={"root_id": root_id},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.headers["content-type"] == "image/png"
+    assert second.content == first.content
+    assert third.status_code == 304
+    assert len(renders) == 1
@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.api import admin as admin_module
+from app.models.user import User
+
+
+class FakeScalarDb:
+    def __init__(self, scalar_result=None):
+        self._scalar_result = scalar_result
+
+    def scalar(self, *_args, **_kwargs):
+        return self._scalar_result
+
+
+def test_validate_root_ids_rejects_missing_roots():
+    with pytest.raises(HTTPException) as exc:
+        admin_module._validate_root_ids(FakeScalarDb(scalar_result=1), [uuid.uuid4(), uuid.uuid4()])
+
+    assert exc.value.status_code == 404
+
+
+def test_validate_root_ids_accepts_existing_roots():
+    root_ids = [uuid.uuid4(), uuid.uuid4()]
+
+    assert admin_module._validate_root_ids(FakeScalarDb(scalar_result=2), root_ids) == root_ids
+
+
+def test_validate_root_ids_skips_query_for_empty_list():
+    assert admin_module._validate_root_ids(object(), []) == []
+
+
+def test_update_user_request_keeps_missing_email_unset():
+    payload = admin_module.UpdateUserRequest(role="ADMIN")
+
+    assert payload.email is None
+    assert "email" not in payload.model_fields_set
+
+
+def test_create_user_request_dedupes_root_ids():
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    payload = admin_module.CreateUserRequest(
+        email="user@example.com",
+        password="StrongPassword!2026",
+        root_ids=[first, second, first],
+    )
+
+    assert payload.root_ids == [first, second]
+
+
+def test_update_user_request_limits_root_ids():
+    with pytest.raises(ValidationError):
+        admin_module.UpdateUserRequest(root_ids=[uuid.uuid4() for _ in range(admin_module.MAX_ROOT_IDS_PER_USER + 1)])
+
+
+def test_user_model_stores_lowercase_email():
+    user = User(email=" Admin@Example.COM", password_hash="x")
+
+    assert user.email == "admin@example.com"
@@ -1,10 +1,18 @@
 import uuid
 from dataclasses import dataclass
+from types import SimpleNamespace
 
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.api import auth as auth_module
+from app.api import deps as deps_module
+from app.core import jwt as jwt_module
+from app.core import security as security_module
+from app.core.security import generate_temporary_password, validate_password_policy
+from app.models.user import UserRole
 
 
 @dataclass
@@ -44,3 +52,158 @@ def test_login_wrong_password(monkeypatch):
 
     assert response.status_code == 401
     assert response.json()["detail"] == "Invalid credentials"
+
+
+def test_decode_token_reuses_verified_token(monkeypatch):
+    token = jwt_module.create_access_token(
+        SimpleNamespace(id=uuid.uuid4(), email="admin@test.local", role=UserRole.ADMIN)
+    )
+    calls = []
+    real_decode = jwt_module._JWT.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_module._JWT, "decode", counting_decode)
+
+    first = jwt_module.decode_token(token, expected_type="access")
+    second = jwt_module.decode_token(token, expected_type="access")
+
+    assert first == second
+    assert calls == [token]
+    with pytest.raises(TypeError):
+        first["role"] = "USER"
+
+
+def test_decode_token_checks_type_on_cached_token():
+    token = jwt_module.create_refresh_token(
+        SimpleNamespace(id=uuid.uuid4(), email="admin@test.local", role=UserRole.ADMIN)
+    )
+    jwt_module.decode_token(token, expected_type="refresh")
+
+    with pytest.raises(HTTPException) as exc:
+        jwt_module.decode_token(token, expected_type="access")
+
+    assert exc.value.status_code == 401
+
+
+class FakeUserLookupDb:
+    def __init__(self, user=None):
+        self._user = user
+
+    def scalar(self, *_args, **_kwargs):
+        return self._user
+
+
+def test_authenticate_credentials_verifies_dummy_hash_for_unknown_email(monkeypatch):
+    checked_hashes = []
+
+    def fake_verify(_password, password_hash):
+        checked_hashes.append(password_hash)
+        return False
+
+    monkeypatch.setattr(auth_module, "verify_password", fake_verify)
+
+    assert auth_module.authenticate_credentials(FakeUserLookupDb(), "missing@test.local", "Whatever!2026") is None
+    assert checked_hashes == [auth_module._DUMMY_PASSWORD_HASH]
+
+
+def test_authenticate_credentials_rejects_inactive_user(monkeypatch):
+    user = SimpleNamespace(password_hash="hash", is_active=False)
+
+    monkeypatch.setattr(auth_module, "verify_password", lambda _password, _hash: True)
+
+    assert auth_module.authenticate_credentials(FakeUserLookupDb(user), "user@test.local", "Whatever!2026") is None
+
+
+def test_parse_subject_reuses_parsed_uuid():
+    subject = str(uuid.uuid4())
+
+    assert jwt_module.parse_subject(subject) == uuid.UUID(subject)
+    assert jwt_module.parse_subject(subject) is jwt_module.parse_subject(subject)
+
+
+def test_parse_subject_rejects_invalid_value():
+    with pytest.raises(ValueError):
+        jwt_module.parse_subject("not-a-uuid")
+
+
+def test_me_returns_not_modified_for_matching_etag():
+    user = SimpleNamespace(
+        id=uuid.uuid4(),
+        email="admin@test.local",
+        role=UserRole.ADMIN,
+        is_active=True,
+        must_change_password=False,
+    )
+    app.dependency_overrides[deps_module.require_user] = lambda: user
+    try:
+        client = TestClient(app)
+        first = client.get("/api/auth/me")
+        second = client.get("/api/auth/me", headers={"If-None-Match": first.headers["ETag"]})
+        user.must_change_password = True
+        third = client.get("/api/auth/me", headers={"If-None-Match": first.headers["ETag"]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+    assert third.status_code == 200
+    assert third.headers["ETag"] != first.headers["ETag"]
+
+
+def test_login_request_normalizes_email():
+    payload = auth_module.LoginRequest(email="  Admin@Test.LOCAL ", password="Whatever!2026")
+
+    assert payload.email == "admin@test.local"
+
+
+@pytest.mark.parametrize(
+    ("password", "expected"),
+    [
+        ("Abcdefghij1!", True),
+        ("Abcdefghij1ą", True),
+        ("Abcdefghi1!", False),
+        ("abcdefghij1!", False),
+        ("ABCDEFGHIJ1!", False),
+        ("Abcdefghijk!", False),
+        ("Abcdefghijk1", False),
+    ],
+)
+def test_password_policy_requires_each_character_class(password, expected):
+    assert validate_password_policy(password) is expected
+
+
+@pytest.mark.parametrize("length", [4, 12, 16, 32])
+def test_temporary_password_always_meets_policy(length):
+    for _ in range(200):
+        password = generate_temporary_password(length)
+
+        assert len(password) == max(length, 12)
+        assert validate_password_policy(password)
+
+
+def test_verify_password_caches_only_successful_checks(monkeypatch):
+    def fast_hash(password):
+        return security_module.bcrypt.hashpw(password.encode("utf-8"), security_module.bcrypt.gensalt(rounds=4)).decode()
+
+    password_hash = fast_hash("Secret!2026ab")
+    calls = []
+    real_checkpw = security_module.bcrypt.checkpw
+
+    def counting_checkpw(password, hashed):
+        calls.append(password)
+        return real_checkpw(password, hashed)
+
+    monkeypatch.setattr(security_module.bcrypt, "checkpw", counting_checkpw)
+
+    assert security_module.verify_password("Secret!2026ab", password_hash)
+    assert security_module.verify_password("Secret!2026ab", password_hash)
+    assert not security_module.verify_password("Wrong!2026ab", password_hash)
+    assert not security_module.verify_password("Wrong!2026ab", password_hash)
+    assert calls == [b"Secret!2026ab", b"Wrong!2026ab", b"Wrong!2026ab"]
+
+    assert security_module.verify_password("Secret!2026ab", fast_hash("Secret!2026ab"))
+    assert len(calls) == 4